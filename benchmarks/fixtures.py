@@ -0,0 +1,120 @@
+import json
+import os
+import random
+from datetime import datetime, timedelta, time as dtime
+
+import pytz
+
+# -----------------------
+# Synthetic fixture corpus
+# -----------------------
+# Layout written by make_dataset():
+#   serp_corpus.json      news_results items, each tagged with its keyword;
+#                         "link" is a path the stub server prefixes with the
+#                         publisher server's address
+#   publisher/<id>.html   article pages (blocked ids answer 403)
+#   diffbot/<id>.json     Diffbot article responses for every id
+#   manifest.json         dataset parameters
+FILLER_WORDS = (
+    "market investors board quarter company shares growth ministry court order filing "
+    "bank lenders capital report statement policy framework minister committee review "
+    "data sector index profit revenue credit exchange listed circular public sources "
+    "official week month year percent crore lakh India Mumbai Delhi earlier said added"
+).split()
+
+
+def paragraph(rng, keyword, words=60):
+    body = [rng.choice(FILLER_WORDS) for _ in range(words)]
+    for _ in range(rng.randint(1, 3)):
+        body.insert(rng.randrange(len(body)), keyword)
+    return " ".join(body).capitalize() + "."
+
+
+def article_html(title, paragraphs):
+    body = "\n".join(f"<p>{text}</p>" for text in paragraphs)
+    return (
+        f"<!DOCTYPE html><html><head><title>{title}</title></head><body>"
+        f"<header><nav><a href='/'>Home</a> <a href='/markets'>Markets</a></nav></header>"
+        f"<article><h1>{title}</h1>{body}</article>"
+        f"<footer><p>Copyright. All rights reserved.</p></footer></body></html>"
+    )
+
+
+def make_dataset(directory, keywords, sites, articles=200, blocked=0.2, outside=0.2,
+                 windows=((1, 7, 12),), now_ist=None, seed=7):
+    # windows: (days back, start hour, end hour) in IST, as in
+    # TIME_WINDOW_HOURS; in-window items are spread over all of them and a
+    # share `outside` of the items is dated outside every window - before
+    # the first one or in the gaps between them
+    rng = random.Random(seed)
+    ist = pytz.timezone("Asia/Kolkata")
+    now_ist = now_ist or datetime.now(ist)
+    spans = []
+    for days_back, start_hour, end_hour in windows:
+        day = (now_ist - timedelta(days=days_back)).date()
+        spans.append((
+            ist.localize(datetime.combine(day, dtime(start_hour))),
+            ist.localize(datetime.combine(day, dtime(0)) + timedelta(hours=end_hour)),
+        ))
+    earliest = min(start for start, _ in spans)
+    latest = max(end for _, end in spans)
+
+    def outside_windows():
+        for _ in range(20):
+            if rng.random() < 0.5:
+                published = earliest - timedelta(seconds=rng.randint(3600, 3 * 86400))
+            else:
+                published = earliest + timedelta(seconds=rng.randint(0, int((latest - earliest).total_seconds()) - 1))
+            if not any(start <= published < end for start, end in spans):
+                return published
+        return earliest - timedelta(seconds=rng.randint(3600, 3 * 86400))
+
+    os.makedirs(os.path.join(directory, "publisher"), exist_ok=True)
+    os.makedirs(os.path.join(directory, "diffbot"), exist_ok=True)
+
+    corpus = []
+    blocked_ids = []
+    for number in range(articles):
+        article_id = f"a{number:05d}"
+        keyword = keywords[number % len(keywords)]
+        site_index = number % len(sites)
+        title = f"{keyword.title()} update {number}: {rng.choice(FILLER_WORDS)} {rng.choice(FILLER_WORDS)}"
+        if rng.random() < outside:
+            published = outside_windows()
+        else:
+            start, end = rng.choice(spans)
+            published = start + timedelta(seconds=rng.randint(0, int((end - start).total_seconds()) - 1))
+        paragraphs = [paragraph(rng, keyword) for _ in range(rng.randint(4, 9))]
+
+        corpus.append({
+            "keyword": keyword,
+            "title": title,
+            "link": f"/{site_index}/{article_id}.html",
+            "site_index": site_index,
+            "source": {"name": sites[site_index]},
+            "iso_date": published.astimezone(pytz.UTC).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        })
+        with open(os.path.join(directory, "publisher", f"{article_id}.html"), "w") as f:
+            f.write(article_html(title, paragraphs))
+        with open(os.path.join(directory, "diffbot", f"{article_id}.json"), "w") as f:
+            json.dump({"objects": [{
+                "title": title,
+                "author": "Staff Reporter",
+                "siteName": sites[site_index],
+                "text": "\n\n".join(paragraphs),
+            }]}, f)
+        if rng.random() < blocked:
+            blocked_ids.append(article_id)
+
+    corpus.sort(key=lambda item: item["iso_date"], reverse=True)
+    with open(os.path.join(directory, "serp_corpus.json"), "w") as f:
+        json.dump(corpus, f)
+    with open(os.path.join(directory, "manifest.json"), "w") as f:
+        json.dump({
+            "articles": articles,
+            "blocked_ids": blocked_ids,
+            "sites": sites,
+            "keywords": keywords,
+            "windows": [[start.isoformat(), end.isoformat()] for start, end in spans],
+        }, f)
+    return directory
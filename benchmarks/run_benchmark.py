@@ -0,0 +1,226 @@
+import argparse
+import contextlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+# -----------------------
+# Offline end-to-end benchmark
+# -----------------------
+# Replays a synthetic corpus through the pipeline and send_email against
+# local stubs (SerpAPI, Diffbot, publishers, SMTP) - no network or API
+# credits. Scenarios:
+#   single     fetch_news_for_keywords for one briefing (BRIEFING)
+#   briefings  fetch_briefings over every enabled briefing, as main() runs
+#              it, with the corpus spread over all their windows
+# Each dataset size and scenario runs in its own process with its own
+# cache: a cold pass, then a warm pass that replays the stored responses.
+# Coverage compares each briefing's stories with the corpus items in its
+# window, so a window the searches miss shows up. Paging losses only
+# appear once queries need several pages (--articles 2000 and up).
+#
+#   python benchmarks/run_benchmark.py --articles 200,2000 --latency-ms 30
+#
+# Needs the pipeline's own requirements (requests, trafilatura, pytz, ...).
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+BRIEFING = "new_member"  # briefings.json entry of the single scenario
+SCENARIOS = ("single", "briefings")
+RESULT_PREFIX = "BENCH_RESULT "
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0  # KiB on Linux
+
+
+def run_child(args):
+    sys.path.insert(0, REPO_DIR)
+    sys.path.insert(0, BENCH_DIR)
+    from smtp_stub import SMTPSink
+
+    workdir = tempfile.mkdtemp(prefix="news-bench-")
+    sink = SMTPSink()
+    # Read by the pipeline's modules at import time
+    os.environ.update({
+        "NEWS_CACHE_DIR": os.path.join(workdir, "cache"),
+        "NEWS_METRICS_DIR": os.path.join(workdir, "metrics"),
+        "SMTP_HOST": "127.0.0.1",
+        "SMTP_PORT": str(sink.port),
+        "SMTP_STARTTLS": "0",
+        "SERPAPI_MONTHLY_QUOTA": "100000",
+    })
+    for number in range(1, 7):
+        os.environ[f"SERPAPI_KEY{number}"] = f"bench-serp-{number}"
+    for number in range(1, 4):
+        os.environ[f"DIFFBOT_TOKEN{number}"] = f"bench-diffbot-{number}"
+
+    # Pipeline output goes to a log (or stderr with --verbose); stdout only
+    # carries the result line for the parent
+    log = sys.stderr if args.verbose else open(os.path.join(workdir, "pipeline.log"), "w")
+    with contextlib.redirect_stdout(log):
+        import news_http
+        import regulatory_news_daily as pipeline
+        from fixtures import make_dataset
+        from stub_server import StubServers
+        from news_config import briefing_keywords
+
+        if args.scenario == "single":
+            configured = [b for b in pipeline.CONFIG["briefings"] if b["name"] == BRIEFING]
+        else:
+            configured = pipeline.enabled_briefings(pipeline.CONFIG)
+        briefings = {
+            b["name"]: (briefing_keywords(pipeline.CONFIG, b), b["window"]) for b in configured
+        }
+        keywords = list(dict.fromkeys(keyword for words, _ in briefings.values() for keyword in words))
+        modes = list(dict.fromkeys(mode for _, mode in briefings.values()))
+        now_ist = datetime.now(pipeline.pytz.timezone("Asia/Kolkata"))
+        fixture_dir = args.fixtures or make_dataset(
+            os.path.join(workdir, "fixtures"), keywords, pipeline.NEWS_SITES,
+            articles=args.articles, blocked=args.blocked,
+            windows=[pipeline.TIME_WINDOW_HOURS[mode] for mode in modes], now_ist=now_ist,
+        )
+        stubs = StubServers(fixture_dir, latency_ms=args.latency_ms)
+        # Ports are only known now, so the endpoints are set on the module
+        # (the SERPAPI_URL/DIFFBOT_ARTICLE_URL env vars do the same for a
+        # real run) and the stubs get the real services' host limits
+        for name, url in stubs.endpoints().items():
+            setattr(pipeline, name, url)
+        news_http.HOST_CONCURRENCY[urlsplit(stubs.base(stubs.serpapi)).netloc] = news_http.HOST_CONCURRENCY["serpapi.com"]
+        news_http.HOST_CONCURRENCY[urlsplit(stubs.base(stubs.diffbot)).netloc] = news_http.HOST_CONCURRENCY["api.diffbot.com"]
+        pipeline.init_time_windows(now_ist)
+
+    # Corpus items each briefing should find: its keywords, its window
+    expected = {}
+    for name, (words, mode) in briefings.items():
+        wanted = {keyword.lower() for keyword in words}
+        expected[name] = sum(
+            1 for item in stubs.fixtures.corpus
+            if item["keyword"].lower() in wanted and pipeline.in_time_window(
+                datetime.strptime(item["iso_date"], "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=pipeline.pytz.UTC), mode
+            )
+        )
+
+    passes = []
+    for label in ("cold", "warm"):
+        before = dict(stubs.requests)
+        messages = sink.messages
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(log):
+            if args.scenario == "single":
+                (name, (words, mode)), = briefings.items()
+                results = {name: pipeline.fetch_news_for_keywords(words, mode, force_fresh=True)}
+            else:
+                results = pipeline.fetch_briefings(briefings, force_fresh=True)
+            fetched = time.perf_counter()
+            for name, data in results.items():
+                pipeline.send_email(
+                    sender="bench@example.com", password="bench", recipient="reader@example.com",
+                    subject=f"Benchmark {label} {name}", data=data, time_window=label,
+                )
+        finished = time.perf_counter()
+        found = {name: len({id(art) for arts in data.values() for art in arts}) for name, data in results.items()}
+        articles = len({id(art) for data in results.values() for arts in data.values() for art in arts})
+        passes.append({
+            "pass": label,
+            "wall_seconds": round(finished - started, 3),
+            "fetch_seconds": round(fetched - started, 3),
+            "email_seconds": round(finished - fetched, 3),
+            "articles": articles,
+            "coverage": {name: [found[name], expected[name]] for name in briefings},
+            "articles_per_second": round(articles / (finished - started), 2) if finished > started else 0.0,
+            "requests": {role: stubs.requests[role] - before[role] for role in before},
+            "emails": sink.messages - messages,
+            "smtp_connections": sink.connections,  # Cumulative: reused across passes
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+        })
+
+    with contextlib.redirect_stdout(log):
+        pipeline.get_mailer().close()
+        pipeline.metrics.write()
+    stubs.stop()
+    sink.stop()
+    if log is not sys.stderr:
+        log.close()
+    print(RESULT_PREFIX + json.dumps({
+        "scenario": args.scenario,
+        "dataset": {"articles": args.articles, "blocked": args.blocked, "latency_ms": args.latency_ms},
+        "passes": passes,
+        "workdir": workdir,
+    }))
+
+
+def run_parent(args):
+    results = []
+    scenarios = [value.strip() for value in args.scenarios.split(",") if value.strip()]
+    runs = [
+        (size, scenario)
+        for size in [int(value) for value in args.articles_list.split(",") if value.strip()]
+        for scenario in scenarios
+    ]
+    for size, scenario in runs:
+        command = [
+            sys.executable, os.path.abspath(__file__), "--child", "--scenario", scenario,
+            "--articles", str(size), "--blocked", str(args.blocked), "--latency-ms", str(args.latency_ms),
+        ]
+        if args.fixtures:
+            command += ["--fixtures", args.fixtures]
+        if args.verbose:
+            command.append("--verbose")
+        print(f"[Bench] {size} articles, {scenario} ...", flush=True)
+        # Run outside the repo so a local .env can't point at real services
+        output = subprocess.run(command, cwd=tempfile.gettempdir(), stdout=subprocess.PIPE,
+                                stderr=None if args.verbose else subprocess.PIPE, text=True, check=False)
+        lines = (output.stdout or "").splitlines()
+        result = next((json.loads(line[len(RESULT_PREFIX):]) for line in lines if line.startswith(RESULT_PREFIX)), None)
+        if result is None:
+            print(f"[Bench] {size} articles, {scenario} failed:\n{output.stderr or ''}")
+            continue
+        results.append(result)
+        for run in result["passes"]:
+            print(
+                f"[Bench] {size:>6} | {scenario:<9} | {run['pass']:<4} | {run['wall_seconds']:>7.2f}s "
+                f"(fetch {run['fetch_seconds']:.2f}s, email {run['email_seconds']:.2f}s) | "
+                f"{run['articles']} articles, {run['articles_per_second']}/s | "
+                f"serp {run['requests']['serpapi']}, pages {run['requests']['publisher']}, "
+                f"diffbot {run['requests']['diffbot']} | {run['peak_rss_mb']} MB peak"
+            )
+            print("[Bench]        coverage " + ", ".join(
+                f"{name} {found}/{expected}" for name, (found, expected) in run["coverage"].items()
+            ))
+        print(f"[Bench] Logs and metrics: {result['workdir']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"[Bench] Results written to {args.json}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmark against local stubs")
+    parser.add_argument("--articles", dest="articles_list", default="200",
+                        help="comma-separated corpus sizes, one run each")
+    parser.add_argument("--blocked", type=float, default=0.2, help="share of pages that need Diffbot")
+    parser.add_argument("--latency-ms", type=float, default=0, help="added latency per stub request")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"comma-separated scenarios to run ({', '.join(SCENARIOS)})")
+    parser.add_argument("--scenario", choices=SCENARIOS, help=argparse.SUPPRESS)
+    parser.add_argument("--fixtures", help="use an existing fixture directory instead of generating one")
+    parser.add_argument("--json", help="write all results to this file")
+    parser.add_argument("--verbose", action="store_true", help="show the pipeline's own output")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        args.articles = int(args.articles_list)
+        run_child(args)
+    else:
+        run_parent(args)
+
+
+if __name__ == "__main__":
+    main()
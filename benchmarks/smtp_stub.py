@@ -0,0 +1,81 @@
+import socketserver
+import threading
+
+# -----------------------
+# Minimal SMTP sink
+# -----------------------
+# Enough of RFC 5321 for smtplib: EHLO/HELO, AUTH (anything accepted),
+# MAIL, RCPT, DATA, RSET, NOOP, QUIT. No STARTTLS - run the pipeline with
+# SMTP_STARTTLS=0 against it.
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write((line + "\r\n").encode("ascii"))
+
+    def handle(self):
+        sink = self.server.sink
+        with sink.lock:
+            sink.connections += 1
+        self.reply("220 localhost SMTP stub ready")
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            line = raw.decode("utf-8", "replace").rstrip("\r\n")
+            command = line[:4].upper()
+            if command in ("EHLO", "HELO"):
+                if command == "EHLO":
+                    self.reply("250-localhost")
+                    self.reply("250-AUTH PLAIN LOGIN")
+                    self.reply("250 8BITMIME")
+                else:
+                    self.reply("250 localhost")
+            elif command == "AUTH":
+                parts = line.split()
+                if len(parts) == 2 and parts[1].upper() == "LOGIN":
+                    # Username and password prompts, answers ignored
+                    self.reply("334 VXNlcm5hbWU6")
+                    self.rfile.readline()
+                    self.reply("334 UGFzc3dvcmQ6")
+                    self.rfile.readline()
+                self.reply("235 Authentication successful")
+            elif command in ("MAIL", "RCPT", "RSET", "NOOP"):
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                size = 0
+                while True:
+                    chunk = self.rfile.readline()
+                    if not chunk or chunk in (b".\r\n", b".\n"):
+                        break
+                    size += len(chunk)
+                with sink.lock:
+                    sink.messages += 1
+                    sink.bytes += size
+                self.reply("250 Message accepted")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class SMTPSink:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = 0
+        self.bytes = 0
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), SMTPHandler)
+        self.server.daemon_threads = True
+        self.server.sink = self
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def port(self):
+        return self.server.server_address[1]
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
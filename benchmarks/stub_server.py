@@ -0,0 +1,184 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# -----------------------
+# Local stand-ins for SerpAPI, Diffbot and the publisher sites
+# -----------------------
+# Every service gets its own port (= its own host for news_http's per-host
+# limits); each publisher site gets one too, like the real sites.
+_quoted = re.compile(r'"([^"]+)"')
+_article_id = re.compile(r"/(a\d+)\.html$")
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+def parse_tbs(tbs):
+    # (first IST day, last IST day or None, sort by date) from a tbs value
+    # such as "cdr:1,cd_min:10/16/2026,cd_max:10/16/2026,sbd:1"; qdr:d is
+    # the last 24 hours
+    fields = dict(part.split(":", 1) for part in tbs.split(",") if ":" in part)
+    by_date = fields.get("sbd") == "1"
+    if "cd_min" in fields:
+        first = datetime.strptime(fields["cd_min"], "%m/%d/%Y").date()
+        last = datetime.strptime(fields.get("cd_max", fields["cd_min"]), "%m/%d/%Y").date()
+        return first, last, by_date
+    if fields.get("qdr") == "d":
+        return (datetime.now(IST) - timedelta(days=1)).date(), None, by_date
+    return None, None, by_date
+
+
+def item_day(item):
+    return datetime.strptime(item["iso_date"], "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc).astimezone(IST).date()
+
+
+class Fixtures:
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, "serp_corpus.json")) as f:
+            self.corpus = json.load(f)
+        with open(os.path.join(directory, "manifest.json")) as f:
+            self.manifest = json.load(f)
+        self.blocked = set(self.manifest["blocked_ids"])
+
+    def read(self, *parts):
+        path = os.path.join(self.directory, *parts)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+
+def make_handler(stubs, role):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, like the real services
+
+        def log_message(self, format, *args):
+            pass
+
+        def send(self, status, body, content_type="application/json"):
+            if isinstance(body, str):
+                body = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if stubs.latency:
+                time.sleep(stubs.latency)
+            with stubs.lock:
+                stubs.requests[role] += 1
+            parts = urlsplit(self.path)
+            query = {name: values[0] for name, values in parse_qs(parts.query).items()}
+            if role == "serpapi":
+                self.serpapi(parts.path, query)
+            elif role == "diffbot":
+                self.diffbot(query)
+            else:
+                self.publisher(parts.path)
+
+        def serpapi(self, path, query):
+            if path.endswith("/account"):
+                self.send(200, json.dumps({"total_searches_left": 100000}))
+                return
+            # google_news replay: every corpus item whose keyword is one of
+            # the quoted terms and whose IST day is inside the tbs date
+            # range; newest first with sbd:1, otherwise in a fixed
+            # "relevance" order; paged by start/num
+            wanted = {term.lower() for term in _quoted.findall(query.get("q", ""))}
+            first, last, by_date = parse_tbs(query.get("tbs", ""))
+            matches = [
+                item for item in stubs.fixtures.corpus
+                if item["keyword"].lower() in wanted
+                and (first is None or first <= item_day(item))
+                and (last is None or item_day(item) <= last)
+            ]
+            if not by_date:
+                matches.sort(key=lambda item: hashlib.md5(item["link"].encode("utf-8")).hexdigest())
+            start = int(query.get("start", 0))
+            num = int(query.get("num", 10))
+            page = [
+                {
+                    "title": item["title"],
+                    "link": stubs.publisher_base(item["site_index"]) + item["link"],
+                    "source": item["source"],
+                    "iso_date": item["iso_date"],
+                }
+                for item in matches[start:start + num]
+            ]
+            self.send(200, json.dumps({
+                "search_metadata": {"status": "Success"},
+                "news_results": page,
+            }))
+
+        def diffbot(self, query):
+            url = query.get("url", "")
+            match = _article_id.search(urlsplit(url).path)
+            body = stubs.fixtures.read("diffbot", f"{match.group(1)}.json") if match else None
+            if body is None:
+                self.send(200, json.dumps({"errorCode": 404, "error": "Could not download page"}))
+                return
+            data = json.loads(body)
+            data["objects"][0]["pageUrl"] = url
+            self.send(200, json.dumps(data))
+
+        def publisher(self, path):
+            match = _article_id.search(path)
+            if not match:
+                self.send(404, "not found", "text/plain")
+                return
+            if match.group(1) in stubs.fixtures.blocked:
+                self.send(403, "<html><body>Subscribe to continue reading</body></html>", "text/html")
+                return
+            body = stubs.fixtures.read("publisher", f"{match.group(1)}.html")
+            if body is None:
+                self.send(404, "not found", "text/plain")
+            else:
+                self.send(200, body, "text/html; charset=utf-8")
+
+    return Handler
+
+
+class StubServers:
+    def __init__(self, fixture_dir, latency_ms=0):
+        self.fixtures = Fixtures(fixture_dir)
+        self.latency = latency_ms / 1000.0
+        self.lock = threading.Lock()
+        self.requests = {"serpapi": 0, "diffbot": 0, "publisher": 0}
+        self.servers = []
+        self.serpapi = self._start("serpapi")
+        self.diffbot = self._start("diffbot")
+        self.publishers = [self._start("publisher") for _ in self.fixtures.manifest["sites"]]
+
+    def _start(self, role):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(self, role))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.servers.append(server)
+        return server
+
+    @staticmethod
+    def base(server):
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    def publisher_base(self, site_index):
+        return self.base(self.publishers[site_index])
+
+    def endpoints(self):
+        return {
+            "SERPAPI_URL": self.base(self.serpapi) + "/search",
+            "SERPAPI_ACCOUNT_URL": self.base(self.serpapi) + "/account",
+            "DIFFBOT_ARTICLE_URL": self.base(self.diffbot) + "/v3/article",
+        }
+
+    def stop(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,77 @@
+from news_dedupe import simhash
+from news_render import SNIPPET_CHARS
+from news_store import get_store
+
+
+# -----------------------
+# Compact article record
+# -----------------------
+class Article:
+    # What the pipeline keeps in memory per story: metadata, the email
+    # snippet and the body's fingerprint. The full body stays in the store
+    # (written at extraction time) and is only read back on demand via
+    # .content. Supports the dict-style access the pipeline already uses.
+    __slots__ = (
+        "headline", "author", "site_name", "url", "source_url", "published_at",
+        "snippet", "truncated", "content_length", "fingerprint",
+        "keywords", "keyword_hits", "relevance", "other_sources",
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    @classmethod
+    def from_extracted(cls, data, source_url):
+        # source_url: the link that was extracted, i.e. the body's store key
+        content = data.get("content") or ""
+        return cls(
+            headline=data.get("headline"),
+            author=data.get("author"),
+            site_name=data.get("site_name"),
+            url=data.get("url") or source_url,
+            source_url=source_url,
+            published_at=data.get("published_at"),
+            snippet=content[:SNIPPET_CHARS],
+            truncated=len(content) > SNIPPET_CHARS,
+            content_length=len(content),
+            fingerprint=data.get("fingerprint") if data.get("fingerprint") is not None else simhash(content),
+        )
+
+    @property
+    def content(self):
+        # Full body from the store; the snippet if it has been evicted
+        content = get_store().get_content(self.source_url or self.url)
+        return content if content is not None else self.snippet
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__ if getattr(self, name) is not None}
+
+    @classmethod
+    def from_dict(cls, fields):
+        return cls(**fields)
+
+    def replace(self, **changes):
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes)
+        return Article(**fields)
+
+    # === dict-style access ===
+    def get(self, key, default=None):
+        if key != "content" and key not in self.__slots__:
+            return default
+        value = getattr(self, key)
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        if key != "content" and key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.__slots__ and getattr(self, key) is not None
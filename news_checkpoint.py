@@ -0,0 +1,118 @@
+import json
+import os
+import threading
+
+from news_article import Article
+from news_store import CACHE_DIR
+
+# -----------------------
+# Configuration
+# -----------------------
+# Lives next to the store so the workflow's cache step carries it over to
+# a re-run of a failed job
+STATE_FILE = os.getenv("NEWS_STATE_FILE", os.path.join(CACHE_DIR, "run_state.json"))
+
+
+# -----------------------
+# Run checkpoint
+# -----------------------
+class RunCheckpoint:
+    # Completed fetch-plan units (with their scored articles) and the
+    # briefings already sent, rewritten after every unit. A --resume run
+    # with the same signature restores those and only does the rest.
+    def __init__(self, path=STATE_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.signature = None
+        self.started_at = None
+        self.articles = {}  # article key -> fields
+        self.units = {}  # plan key -> [article key]
+        self.sent = []
+        self.restored = {}  # article key -> Article, shared between units
+
+    @classmethod
+    def load(cls, path=STATE_FILE):
+        checkpoint = cls(path)
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        checkpoint.signature = state.get("signature")
+        checkpoint.started_at = state.get("started_at")
+        checkpoint.articles = state.get("articles", {})
+        checkpoint.units = state.get("units", {})
+        checkpoint.sent = state.get("sent", [])
+        return checkpoint
+
+    def start(self, signature, started_at):
+        with self.lock:
+            self.signature = signature
+            self.started_at = started_at
+            self.articles = {}
+            self.units = {}
+            self.sent = []
+            self.restored = {}
+            self._write()
+
+    def matches(self, signature):
+        return self.signature == signature
+
+    # === Fetch-plan units ===
+    def completed(self, key):
+        return key in self.units
+
+    def unit_articles(self, key):
+        # Articles shared by several units come back as one object
+        with self.lock:
+            articles = []
+            for article_key in self.units.get(key, []):
+                article = self.restored.get(article_key)
+                if article is None:
+                    article = Article.from_dict(self.articles[article_key])
+                    self.restored[article_key] = article
+                articles.append(article)
+            return articles
+
+    def save_unit(self, key, articles):
+        with self.lock:
+            keys = []
+            for article in articles:
+                article_key = article.source_url or article.url
+                self.articles[article_key] = article.to_dict()
+                keys.append(article_key)
+            self.units[key] = keys
+            self._write()
+
+    # === Sent briefings ===
+    def was_sent(self, name):
+        return name in self.sent
+
+    def mark_sent(self, name):
+        with self.lock:
+            if name not in self.sent:
+                self.sent.append(name)
+                self._write()
+
+    def clear(self):
+        with self.lock:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def _write(self):
+        # Atomic replace, so a crash mid-write keeps the previous state
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp = self.path + ".tmp"
+        with open(temp, "w") as f:
+            json.dump({
+                "signature": self.signature,
+                "started_at": self.started_at,
+                "articles": self.articles,
+                "units": self.units,
+                "sent": self.sent,
+            }, f)
+        os.replace(temp, self.path)
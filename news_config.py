@@ -0,0 +1,69 @@
+import json
+import os
+
+# -----------------------
+# Configuration
+# -----------------------
+# Briefings, keyword sets, time windows and sources; see briefings.json
+CONFIG_FILE = os.getenv(
+    "NEWS_CONFIG", os.path.join(os.path.dirname(os.path.abspath(__file__)), "briefings.json")
+)
+BRIEFING_FIELDS = (
+    "name", "keyword_sets", "window", "sender_env", "password_env", "recipient_env",
+    "banner", "subject", "time_window",
+)
+
+
+# -----------------------
+# Loading and validation
+# -----------------------
+def load_config(path=CONFIG_FILE):
+    # Fails fast with the offending entry named, before any credits are spent
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+
+    for section in ("sources", "keyword_sets", "windows", "briefings"):
+        if not config.get(section):
+            raise ValueError(f"{path}: '{section}' is missing or empty")
+
+    for name, window in config["windows"].items():
+        for field in ("days_back", "start_hour", "end_hour"):
+            if not isinstance(window.get(field), int):
+                raise ValueError(f"{path}: window '{name}' needs an integer '{field}'")
+        if not 0 <= window["start_hour"] < window["end_hour"] <= 24:
+            raise ValueError(f"{path}: window '{name}' must start before it ends, within one day")
+
+    names = set()
+    for briefing in config["briefings"]:
+        missing = [field for field in BRIEFING_FIELDS if field not in briefing]
+        if missing:
+            raise ValueError(f"{path}: briefing {briefing.get('name', '?')} lacks {', '.join(missing)}")
+        if briefing["name"] in names:
+            raise ValueError(f"{path}: briefing name '{briefing['name']}' is used twice")
+        names.add(briefing["name"])
+        unknown = [name for name in briefing["keyword_sets"] if name not in config["keyword_sets"]]
+        if unknown:
+            raise ValueError(f"{path}: briefing '{briefing['name']}' uses unknown keyword sets {unknown}")
+        if briefing["window"] not in config["windows"]:
+            raise ValueError(f"{path}: briefing '{briefing['name']}' uses unknown window '{briefing['window']}'")
+    return config
+
+
+def window_hours(config):
+    # {mode: (days back, start hour, end hour)}
+    return {
+        name: (window["days_back"], window["start_hour"], window["end_hour"])
+        for name, window in config["windows"].items()
+    }
+
+
+def enabled_briefings(config):
+    return [briefing for briefing in config["briefings"] if briefing.get("enabled", True)]
+
+
+def briefing_keywords(config, briefing):
+    # Keyword sets concatenated in order, each keyword once
+    keywords = []
+    for name in briefing["keyword_sets"]:
+        keywords += [keyword for keyword in config["keyword_sets"][name] if keyword not in keywords]
+    return keywords
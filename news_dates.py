@@ -0,0 +1,127 @@
+import calendar
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+# -----------------------
+# SerpAPI publish-date parsing
+# -----------------------
+# Formats seen in google_news results, sniffed by regex so no exception is
+# raised for the common "wrong format" case:
+#   "12/08/2025, 03:30 PM, +0000 UTC"   (date)
+#   "Dec 8, 2025, 3:30 PM" / "Dec 8, 2025"
+#   "2025-12-08T15:30:00Z"              (iso_date)
+#   "3 hours ago" / "yesterday" / "just now"
+MONTHS = {name.lower(): number for number, name in enumerate(calendar.month_abbr) if name}
+MONTHS["sept"] = 9
+
+_us_format = re.compile(
+    r"^(\d{1,2})/(\d{1,2})/(\d{4}),\s*(\d{1,2}):(\d{2})\s*([ap]m)(?:,\s*([+-])(\d{2}):?(\d{2})(?:\s*utc)?)?$"
+)
+_month_format = re.compile(
+    r"^([a-z]{3,4})[a-z]*\.?\s+(\d{1,2}),\s*(\d{4})(?:,?\s*(\d{1,2}):(\d{2})\s*([ap]m))?$"
+)
+_iso_format = re.compile(
+    r"^(\d{4})-(\d{2})-(\d{2})(?:[t ](\d{2}):(\d{2})(?::(\d{2})(?:\.\d+)?)?)?\s*(z|[+-]\d{2}:?\d{2})?$"
+)
+_relative_format = re.compile(
+    r"^(\d+|an?|one)\s+(sec|second|min|minute|hr|hour|day|week|month)s?\s+ago$"
+)
+RELATIVE_UNITS = {
+    "sec": timedelta(seconds=1),
+    "second": timedelta(seconds=1),
+    "min": timedelta(minutes=1),
+    "minute": timedelta(minutes=1),
+    "hr": timedelta(hours=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=30),
+}
+
+
+def _build(year, month, day, hour=0, minute=0, second=0, offset_minutes=0):
+    # Range-check instead of letting datetime() raise
+    if not (1 <= month <= 12) or not (1 <= day <= calendar.monthrange(year, month)[1]):
+        return None
+    if hour > 23 or minute > 59 or second > 59:
+        return None
+    local = datetime(year, month, day, hour, minute, second, tzinfo=timezone.utc)
+    return local - timedelta(minutes=offset_minutes)
+
+
+def _hour_24(hour, meridiem):
+    if not 1 <= hour <= 12:
+        return 99  # Rejected by _build
+    return hour % 12 + (12 if meridiem == "pm" else 0)
+
+
+def _offset(sign, hours, minutes):
+    if not sign:
+        return 0
+    total = int(hours) * 60 + int(minutes)
+    return total if sign == "+" else -total
+
+
+@lru_cache(maxsize=4096)
+def _parse_absolute(text):
+    match = _us_format.match(text)
+    if match:
+        month, day, year, hour, minute, meridiem, sign, off_h, off_m = match.groups()
+        return _build(
+            int(year), int(month), int(day), _hour_24(int(hour), meridiem), int(minute),
+            offset_minutes=_offset(sign, off_h, off_m),
+        )
+
+    match = _iso_format.match(text)
+    if match:
+        year, month, day, hour, minute, second, zone = match.groups()
+        offset = 0
+        if zone and zone != "z":
+            zone = zone.replace(":", "")
+            offset = _offset(zone[0], zone[1:3], zone[3:5])
+        return _build(
+            int(year), int(month), int(day), int(hour or 0), int(minute or 0), int(second or 0),
+            offset_minutes=offset,
+        )
+
+    match = _month_format.match(text)
+    if match:
+        month_name, day, year, hour, minute, meridiem = match.groups()
+        month = MONTHS.get(month_name[:4]) or MONTHS.get(month_name[:3])
+        if not month:
+            return None
+        hour = _hour_24(int(hour), meridiem) if hour else 0
+        return _build(int(year), month, int(day), hour, int(minute or 0))
+
+    return None
+
+
+def parse_serp_date(date_str, now=None):
+    # Published time as an aware UTC datetime, or None if unrecognised.
+    # Absolute formats are memoised; relative ones ("3 hours ago") are
+    # resolved against `now` (UTC, defaults to the current time).
+    if not date_str:
+        return None
+    text = " ".join(date_str.strip().lower().split())
+
+    parsed = _parse_absolute(text)
+    if parsed is not None:
+        return parsed
+
+    now = now or datetime.now(timezone.utc)
+    if text in ("just now", "now"):
+        return now
+    if text == "yesterday":
+        return now - timedelta(days=1)
+    match = _relative_format.match(text)
+    if match:
+        amount, unit = match.groups()
+        count = int(amount) if amount.isdigit() else 1
+        return now - count * RELATIVE_UNITS[unit]
+    return None
+
+
+def parse_result_date(item, now=None):
+    # Prefer SerpAPI's machine-readable iso_date when the result has one
+    return parse_serp_date(item.get("iso_date"), now) or parse_serp_date(item.get("date"), now)
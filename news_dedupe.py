@@ -0,0 +1,207 @@
+import re
+import hashlib
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from news_store import normalize_url
+
+# -----------------------
+# Configuration
+# -----------------------
+# Mobile/AMP hosts that serve the same story as the desktop site
+HOST_ALIASES = {
+    "m.economictimes.com": "economictimes.indiatimes.com",
+    "m.economictimes.indiatimes.com": "economictimes.indiatimes.com",
+    "m.business-standard.com": "business-standard.com",
+    "m.financialexpress.com": "financialexpress.com",
+    "m.moneycontrol.com": "moneycontrol.com",
+    "m.livemint.com": "livemint.com",
+}
+HOST_PREFIXES = ("www.", "amp.", "m.", "mobile.")
+AMP_QUERY_PARAMS = {"amp", "amp_js_v", "amp_gsa", "usqp", "outputtype", "_gsa"}
+
+# SimHash near-duplicate detection: 64-bit signatures over word 3-grams.
+# Copies within SIMHASH_MAX_DISTANCE bits are the same story; split into
+# SIMHASH_MAX_DISTANCE + 1 bands, any such pair shares at least one band
+# exactly (pigeonhole), so only band-mates are ever compared.
+SIMHASH_SHINGLE = 3
+SIMHASH_MAX_WORDS = 600  # Leads carry the syndicated copy; skip long tails
+SIMHASH_MAX_DISTANCE = 5
+SIMHASH_BANDS = SIMHASH_MAX_DISTANCE + 1
+
+_words = re.compile(r"[a-z0-9]+")
+_separators = (" - ", " | ", " – ", " — ")
+
+
+# -----------------------
+# Helper: Canonical URLs and headline keys
+# -----------------------
+def canonical_url(url):
+    parts = urlsplit(normalize_url(url))
+    host = parts.netloc
+    host = HOST_ALIASES.get(host, host)
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    host = HOST_ALIASES.get(host, host)
+
+    # Fold AMP path variants: /amp/..., .../amp, amp_articleshow, amp-123.html, x.amp.html
+    segments = []
+    for segment in parts.path.split("/"):
+        if segment == "amp":
+            continue
+        if segment.startswith("amp_"):
+            segment = segment[4:]
+        elif segment.startswith("amp-"):
+            segment = segment[4:]
+        segment = segment.replace(".amp.", ".")
+        if segment.endswith(".amp"):
+            segment = segment[:-4]
+        segments.append(segment)
+    path = "/".join(segments).rstrip("/") or "/"
+
+    query = [
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in AMP_QUERY_PARAMS
+    ]
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def headline_key(title, site_name=None):
+    # Lowercased words without punctuation or a trailing " - Site Name"
+    title = (title or "").strip().lower()
+    site = (site_name or "").strip().lower()
+    if site:
+        for separator in _separators:
+            if title.endswith(separator + site):
+                title = title[: -len(separator + site)]
+                break
+    return " ".join(_words.findall(title))
+
+
+# -----------------------
+# Run-wide article index
+# -----------------------
+class ArticleIndex:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.by_url = {}
+        self.by_headline = {}
+        self.hits = 0
+
+    def claim(self, url, title, site_name, submit):
+        # Return the extraction future for this story, calling submit() only
+        # the first time a canonical URL or headline is seen in the run
+        url_key = canonical_url(url)
+        title_key = headline_key(title, site_name)
+        with self.lock:
+            future = self.by_url.get(url_key)
+            if future is None and title_key:
+                future = self.by_headline.get(title_key)
+            if future is not None:
+                self.hits += 1
+                self.by_url.setdefault(url_key, future)
+                return future
+            future = submit()
+            self.by_url[url_key] = future
+            if title_key:
+                self.by_headline[title_key] = future
+            return future
+
+
+# -----------------------
+# Near-duplicate clustering (SimHash + banding)
+# -----------------------
+def url_domain(url):
+    # Publisher host with mobile/AMP prefixes folded
+    return urlsplit(canonical_url(url)).netloc
+
+
+def url_hash(url):
+    return hashlib.sha1(canonical_url(url).encode("utf-8")).hexdigest()
+
+
+def simhash(text):
+    words = _words.findall((text or "").lower())[:SIMHASH_MAX_WORDS]
+    if len(words) < SIMHASH_SHINGLE:
+        words = words + [""] * (SIMHASH_SHINGLE - len(words))
+    hashes = {
+        hashlib.blake2b(" ".join(words[i:i + SIMHASH_SHINGLE]).encode("utf-8"), digest_size=8).digest()
+        for i in range(len(words) - SIMHASH_SHINGLE + 1)
+    }
+    # Per-bit majority vote; zip() over the bit strings counts columns in C
+    bits = [format(int.from_bytes(h, "big"), "064b") for h in hashes]
+    half = len(bits) / 2
+    signature = 0
+    for column in zip(*bits):
+        signature = (signature << 1) | (column.count("1") > half)
+    return signature
+
+
+def simhash_bands(signature):
+    band_bits = 64 // SIMHASH_BANDS
+    mask = (1 << band_bits) - 1
+    return [(band, (signature >> (band * band_bits)) & mask) for band in range(SIMHASH_BANDS)]
+
+
+def cluster_articles(articles):
+    # Group near-duplicate bodies without pairwise comparison: only articles
+    # sharing a band are compared. Returns lists of articles, each list led
+    # by its representative (the fullest copy).
+    signatures = [art.get("fingerprint") or simhash(art.get("content")) for art in articles]
+    parent = list(range(len(articles)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets = {}
+    for i, signature in enumerate(signatures):
+        for key in simhash_bands(signature):
+            for j in buckets.get(key, ()):
+                if find(i) != find(j) and bin(signature ^ signatures[j]).count("1") <= SIMHASH_MAX_DISTANCE:
+                    parent[find(i)] = find(j)
+            buckets.setdefault(key, []).append(i)
+
+    groups = {}
+    for i in range(len(articles)):
+        groups.setdefault(find(i), []).append(articles[i])
+    clusters = []
+    for members in groups.values():
+        members.sort(key=lambda art: art.get("content_length") or len(art.get("content") or ""), reverse=True)
+        clusters.append(members)
+    return clusters
+
+
+# -----------------------
+# Stories already delivered to a recipient
+# -----------------------
+class SeenSet:
+    # Canonical URL hashes plus body fingerprints, so a copy of a sent story
+    # under a new URL (re-syndicated, re-published) is recognised too
+    def __init__(self, url_hashes=(), fingerprints=()):
+        self.urls = set(url_hashes)
+        self.buckets = {}
+        for fingerprint in fingerprints:
+            for key in simhash_bands(fingerprint):
+                self.buckets.setdefault(key, []).append(fingerprint)
+
+    def has_url(self, url):
+        return url_hash(url) in self.urls
+
+    def has_story(self, article):
+        if self.has_url(article.get("url")):
+            return True
+        if any(self.has_url(other.get("url")) for other in article.get("other_sources", [])):
+            return True
+        fingerprint = article.get("fingerprint")
+        if fingerprint is None:
+            return False
+        return any(
+            bin(fingerprint ^ seen).count("1") <= SIMHASH_MAX_DISTANCE
+            for key in simhash_bands(fingerprint)
+            for seen in self.buckets.get(key, ())
+        )
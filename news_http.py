@@ -0,0 +1,152 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from news_metrics import metrics
+
+# -----------------------
+# Configuration
+# -----------------------
+# (connect, read) timeouts shared by every call
+HTTP_TIMEOUT = (5, 25)
+
+# How many requests may be in flight to one host at once
+DEFAULT_HOST_CONCURRENCY = 2
+HOST_CONCURRENCY = {
+    "serpapi.com": 6,
+    "api.diffbot.com": 3,
+}
+
+# Keep-alive pools: number of hosts kept open, connections per host
+POOL_HOSTS = 32
+POOL_PER_HOST = max(DEFAULT_HOST_CONCURRENCY, *HOST_CONCURRENCY.values())
+
+# Backoff after 429/5xx or failed calls: doubles per consecutive failure
+BACKOFF_BASE = 2.0
+BACKOFF_MAX = 120.0
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+
+# -----------------------
+# Helper: Per-host concurrency limit
+# -----------------------
+_host_slots = {}
+_host_slots_lock = threading.Lock()
+
+
+def host_slot(url):
+    host = urlparse(url).netloc.lower()
+    with _host_slots_lock:
+        slot = _host_slots.get(host)
+        if slot is None:
+            slot = threading.BoundedSemaphore(HOST_CONCURRENCY.get(host, DEFAULT_HOST_CONCURRENCY))
+            _host_slots[host] = slot
+    return slot
+
+
+# -----------------------
+# Adaptive rate limiter
+# -----------------------
+def parse_retry_after(value):
+    # Retry-After is either delta-seconds or an HTTP date
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    # Tracks 429/5xx responses per scope (a host, or one API key on a host)
+    # and only makes callers wait while that scope is backing off
+    def __init__(self, base=BACKOFF_BASE, maximum=BACKOFF_MAX):
+        self.base = base
+        self.maximum = maximum
+        self.lock = threading.Lock()
+        self.blocked_until = {}
+        self.failures = {}
+
+    def delay(self, scope):
+        with self.lock:
+            return max(0.0, self.blocked_until.get(scope, 0.0) - time.monotonic())
+
+    def wait(self, scope):
+        delay = self.delay(scope)
+        if delay > 0:
+            print(f"[RATE] {scope} backing off {delay:.1f}s")
+            time.sleep(delay)
+            metrics.observe("rate_limit_wait", delay)
+
+    def penalize(self, scope, retry_after=None):
+        # Record a real error; honour Retry-After, else exponential backoff
+        with self.lock:
+            failures = self.failures.get(scope, 0) + 1
+            self.failures[scope] = failures
+            if retry_after is None:
+                delay = min(self.maximum, self.base * 2 ** (failures - 1))
+                delay *= random.uniform(0.75, 1.25)
+            else:
+                delay = min(self.maximum, retry_after)
+            until = time.monotonic() + delay
+            self.blocked_until[scope] = max(self.blocked_until.get(scope, 0.0), until)
+        return delay
+
+    def observe(self, scope, response):
+        if response.status_code == 429 or response.status_code >= 500:
+            delay = self.penalize(scope, parse_retry_after(response.headers.get("Retry-After")))
+            print(f"[RATE] {scope} answered HTTP {response.status_code}, pausing {delay:.1f}s")
+        else:
+            with self.lock:
+                self.failures.pop(scope, None)
+
+
+rate_limiter = RateLimiter()
+
+
+# -----------------------
+# Shared keep-alive session
+# -----------------------
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    # One pooled session for SerpAPI, Diffbot and publishers, so repeat
+    # calls to the same host reuse the TCP+TLS connection
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_PER_HOST, pool_block=True)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["User-Agent"] = USER_AGENT
+            _session = session
+    return _session
+
+
+def http_get(url, params=None, headers=None, timeout=HTTP_TIMEOUT, scope=None):
+    # scope defaults to the host; pass e.g. "serpapi:2" to track one API key
+    scope = scope or urlparse(url).netloc.lower()
+    rate_limiter.wait(scope)
+    with host_slot(url):
+        try:
+            response = get_session().get(url, params=params, headers=headers, timeout=timeout)
+        except Exception:
+            rate_limiter.penalize(scope)
+            raise
+    rate_limiter.observe(scope, response)
+    return response
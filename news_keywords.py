@@ -0,0 +1,134 @@
+from collections import Counter, deque
+from functools import lru_cache
+
+# -----------------------
+# Configuration
+# -----------------------
+# Google ignores query words past 32; site: filters and ORs count too
+MAX_QUERY_WORDS = 32
+
+# Relevance: each distinct keyword in the headline is worth HEADLINE_WEIGHT,
+# each body hit 1 (capped per keyword). Stories scoring below
+# MIN_RELEVANCE_SCORE mention none of the keywords and are pruned.
+HEADLINE_WEIGHT = 3
+MAX_BODY_HITS_PER_KEYWORD = 5
+MIN_RELEVANCE_SCORE = 1
+
+
+# -----------------------
+# Helper: Display groups
+# -----------------------
+def keyword_groups(keywords):
+    # Consecutive pairs as shown in the email; an odd last keyword gets a
+    # group of its own instead of being dropped
+    return [tuple(keywords[i:i + 2]) for i in range(0, len(keywords), 2)]
+
+
+def group_key(group):
+    return "_".join(group)
+
+
+# -----------------------
+# Query packing
+# -----------------------
+def build_keyword_query(keywords):
+    return "(" + " OR ".join(f'"{keyword}"' for keyword in keywords) + ")"
+
+
+def query_words(keywords):
+    return sum(len(keyword.split()) for keyword in keywords) + max(0, len(keywords) - 1)
+
+
+def pack_keywords(keywords, word_budget):
+    # Greedily fill each OR query up to the word budget, keeping keyword
+    # order so related keywords stay together
+    queries = []
+    current = []
+    for keyword in keywords:
+        if current and query_words(current + [keyword]) > word_budget:
+            queries.append(current)
+            current = []
+        current.append(keyword)
+    if current:
+        queries.append(current)
+    return queries
+
+
+# -----------------------
+# Local keyword matching (Aho-Corasick)
+# -----------------------
+class KeywordMatcher:
+    # All keywords (plus plural forms) in one automaton, so a body is
+    # scanned once no matter how many keywords there are
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(keywords))
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for keyword in self.keywords:
+            base = " ".join(keyword.lower().split())
+            for pattern in (base, base + "s", base + "es"):
+                self._add(pattern, keyword)
+        self._link()
+
+    def _add(self, pattern, keyword):
+        node = 0
+        for char in pattern:
+            nxt = self.goto[node].get(char)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][char] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            node = nxt
+        self.output[node].append((len(pattern), keyword))
+
+    def _link(self):
+        # Breadth-first failure links; each node inherits the matches of
+        # its failure target
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                if self.fail[child] == child:
+                    self.fail[child] = 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def scan(self, text):
+        # Whole-word hit counts per keyword, case-insensitive
+        text = " ".join((text or "").lower().split())
+        counts = Counter()
+        goto, fail, output = self.goto, self.fail, self.output
+        last = len(text) - 1
+        node = 0
+        for i, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if not output[node]:
+                continue
+            if i < last and text[i + 1].isalnum():
+                continue
+            for length, keyword in output[node]:
+                start = i - length + 1
+                if start == 0 or not text[start - 1].isalnum():
+                    counts[keyword] += 1
+        return counts
+
+
+@lru_cache(maxsize=8)
+def get_keyword_matcher(keywords):
+    # keywords: tuple, so each keyword set is compiled once per run
+    return KeywordMatcher(keywords)
+
+
+def relevance_score(headline_hits, body_hits):
+    return HEADLINE_WEIGHT * len(headline_hits) + sum(
+        min(count, MAX_BODY_HITS_PER_KEYWORD) for count in body_hits.values()
+    )
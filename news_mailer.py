@@ -0,0 +1,135 @@
+import queue
+import smtplib
+import threading
+import time
+from concurrent.futures import Future
+
+from news_metrics import metrics
+
+# -----------------------
+# Configuration
+# -----------------------
+SMTP_TIMEOUT = 30
+SMTP_MAX_ATTEMPTS = 3
+SMTP_BACKOFF = 2.0  # Seconds before the first retry, doubled after each
+
+
+def is_transient(error):
+    # 4xx replies and dropped connections are worth another try; 5xx
+    # (bad credentials, rejected recipient) are not
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, (smtplib.SMTPServerDisconnected, OSError))
+
+
+# -----------------------
+# Background mailer with pooled connections
+# -----------------------
+class Mailer:
+    # One background thread delivers queued messages in order, so callers
+    # never wait on SMTP. A connection is opened (STARTTLS + login) once per
+    # server/sender and reused for every briefing of the run.
+    def __init__(self, timeout=SMTP_TIMEOUT, attempts=SMTP_MAX_ATTEMPTS, backoff=SMTP_BACKOFF):
+        self.timeout = timeout
+        self.attempts = attempts
+        self.backoff = backoff
+        self.queue = queue.Queue()
+        self.connections = {}
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def submit(self, host, port, sender, password, recipients, message, starttls=True):
+        # Returns a Future: the refused-recipients dict from sendmail, or the
+        # error once the retries are used up
+        future = Future()
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="mailer", daemon=True)
+                self.thread.start()
+            self.queue.put((future, (host, port, sender, password, starttls), recipients, message))
+        return future
+
+    def close(self):
+        # Deliver everything queued, then log out of every server
+        with self.lock:
+            thread, self.thread = self.thread, None
+            if thread is not None:
+                self.queue.put(None)
+        if thread is not None:
+            thread.join()
+
+    def _run(self):
+        try:
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    return
+                future, account, recipients, message = item
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(self._deliver(account, recipients, message))
+                except Exception as e:
+                    future.set_exception(e)
+        finally:
+            for account in list(self.connections):
+                self._drop(account, quit=True)
+
+    def _connect(self, account):
+        connection = self.connections.get(account)
+        if connection is not None:
+            try:
+                connection.noop()
+                return connection
+            except Exception:
+                self._drop(account)
+        host, port, sender, password, starttls = account
+        connection = smtplib.SMTP(host, port, timeout=self.timeout)
+        if starttls:
+            connection.starttls()
+        if password:
+            connection.login(sender, password)
+        self.connections[account] = connection
+        return connection
+
+    def _drop(self, account, quit=False):
+        connection = self.connections.pop(account, None)
+        if connection is None:
+            return
+        try:
+            if quit:
+                connection.quit()
+            else:
+                connection.close()
+        except Exception:
+            pass
+
+    def _deliver(self, account, recipients, message):
+        sender = account[2]
+        for attempt in range(self.attempts):
+            try:
+                connection = self._connect(account)
+                with metrics.timer("smtp"):
+                    return connection.sendmail(sender, recipients, message)
+            except Exception as e:
+                self._drop(account)
+                if not is_transient(e) or attempt == self.attempts - 1:
+                    raise
+                delay = self.backoff * 2 ** attempt
+                print(f"[Mailer] {e} - retrying in {delay:.0f}s ({attempt + 1}/{self.attempts})")
+                metrics.count("smtp_retries")
+                time.sleep(delay)
+
+
+_mailer = None
+_mailer_lock = threading.Lock()
+
+
+def get_mailer():
+    global _mailer
+    with _mailer_lock:
+        if _mailer is None:
+            _mailer = Mailer()
+    return _mailer
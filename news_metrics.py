@@ -0,0 +1,115 @@
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# -----------------------
+# Configuration
+# -----------------------
+# Run summaries land here (uploaded as a workflow artifact)
+METRICS_DIR = os.getenv("NEWS_METRICS_DIR", "metrics")
+METRICS_PREFIX = "news_pipeline"
+
+
+# -----------------------
+# Run-level counters and stage timings
+# -----------------------
+class Metrics:
+    # Thread-safe; stage times are summed across worker threads, so a
+    # stage's total can exceed the run's wall-clock time
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = Counter()
+        self.timings = {}  # stage -> [calls, total seconds, max seconds]
+        self.started = time.time()
+        self.started_mono = time.monotonic()
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] += amount
+
+    def observe(self, stage, seconds):
+        with self.lock:
+            timing = self.timings.setdefault(stage, [0, 0.0, 0.0])
+            timing[0] += 1
+            timing[1] += seconds
+            timing[2] = max(timing[2], seconds)
+
+    @contextmanager
+    def timer(self, stage):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.monotonic() - started)
+
+    def snapshot(self):
+        with self.lock:
+            counters = dict(self.counters)
+            timings = {stage: list(values) for stage, values in self.timings.items()}
+        return {
+            "started_at": datetime.fromtimestamp(self.started, timezone.utc).isoformat(),
+            "run_seconds": round(time.monotonic() - self.started_mono, 3),
+            "counters": counters,
+            "stages": {
+                stage: {
+                    "calls": calls,
+                    "total_seconds": round(total, 3),
+                    "mean_seconds": round(total / calls, 3) if calls else 0.0,
+                    "max_seconds": round(longest, 3),
+                }
+                for stage, (calls, total, longest) in sorted(timings.items())
+            },
+        }
+
+    def to_prometheus(self, snapshot=None):
+        # Prometheus text exposition format (for a textfile collector or
+        # a pushgateway)
+        snapshot = snapshot or self.snapshot()
+        lines = [
+            f"# TYPE {METRICS_PREFIX}_run_seconds gauge",
+            f"{METRICS_PREFIX}_run_seconds {snapshot['run_seconds']}",
+            f"# TYPE {METRICS_PREFIX}_events_total counter",
+        ]
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f'{METRICS_PREFIX}_events_total{{event="{name}"}} {value}')
+        lines.append(f"# TYPE {METRICS_PREFIX}_stage_seconds summary")
+        for stage, timing in snapshot["stages"].items():
+            lines.append(f'{METRICS_PREFIX}_stage_seconds_sum{{stage="{stage}"}} {timing["total_seconds"]}')
+            lines.append(f'{METRICS_PREFIX}_stage_seconds_count{{stage="{stage}"}} {timing["calls"]}')
+        lines.append(f"# TYPE {METRICS_PREFIX}_stage_max_seconds gauge")
+        for stage, timing in snapshot["stages"].items():
+            lines.append(f'{METRICS_PREFIX}_stage_max_seconds{{stage="{stage}"}} {timing["max_seconds"]}')
+        return "\n".join(lines) + "\n"
+
+    def report(self, snapshot=None):
+        snapshot = snapshot or self.snapshot()
+        print(f"[Metrics] Run took {snapshot['run_seconds']:.1f}s")
+        for stage, timing in snapshot["stages"].items():
+            print(
+                f"[Metrics] {stage}: {timing['calls']} calls, {timing['total_seconds']:.1f}s total, "
+                f"{timing['mean_seconds']:.2f}s avg, {timing['max_seconds']:.1f}s max"
+            )
+        if snapshot["counters"]:
+            print("[Metrics] " + ", ".join(f"{name}={value}" for name, value in sorted(snapshot["counters"].items())))
+
+    def write(self, directory=METRICS_DIR):
+        # run_metrics.json and run_metrics.prom; never fails the run
+        snapshot = self.snapshot()
+        self.report(snapshot)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, "run_metrics.json"), "w") as f:
+                json.dump(snapshot, f, indent=2)
+            with open(os.path.join(directory, "run_metrics.prom"), "w") as f:
+                f.write(self.to_prometheus(snapshot))
+            print(f"[Metrics] Summary written to {directory}/")
+        except OSError as e:
+            print(f"[Metrics] Could not write summary: {e}")
+        return snapshot
+
+
+metrics = Metrics()
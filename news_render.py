@@ -0,0 +1,205 @@
+from html import escape
+
+# -----------------------
+# Configuration
+# -----------------------
+SNIPPET_CHARS = 350
+# Gmail clips messages whose HTML passes ~102 KB. Stories get full cards
+# up to HTML_CARDS_BYTES, then headline links only; whatever would take
+# the whole document (footer included) past HTML_BUDGET_BYTES is left to
+# the plain-text part and only counted
+HTML_CARDS_BYTES = 75_000
+HTML_BUDGET_BYTES = 95_000
+
+# Shared styles, emitted once in <head> instead of inline per article
+EMAIL_CSS = """
+body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+.wrap { max-width: 800px; margin: 0 auto; padding: 20px; }
+h1 { color: #2c3e50; border-bottom: 2px solid #3498db; padding-bottom: 10px; }
+h2 { color: #2c3e50; margin-top: 30px; }
+a { text-decoration: none; color: #3498db; }
+.summary { background: #f8f9fa; padding: 15px; border-left: 4px solid #3498db; margin-bottom: 20px; }
+.empty { text-align: center; padding: 40px; color: #7f8c8d; }
+.group { background: white; border: 1px solid #e9ecef; border-radius: 8px; padding: 20px; margin-bottom: 20px; }
+.story { border-bottom: 1px solid #e9ecef; padding: 15px 0; }
+.story h3 { margin: 0 0 8px 0; color: #2c3e50; }
+.meta { margin: 5px 0; color: #7f8c8d; font-size: 14px; }
+.snippet { margin: 10px 0; color: #555; line-height: 1.5; }
+.also { margin: 5px 0; color: #7f8c8d; font-size: 13px; }
+.repeat { margin: 8px 0; color: #7f8c8d; font-size: 14px; }
+.links { margin: 10px 0; padding-left: 20px; }
+.omitted { text-align: center; color: #7f8c8d; }
+.footer { text-align: center; color: #7f8c8d; font-size: 14px; }
+""".strip()
+
+# Layout pieces, filled with str.format and joined once at the end
+HTML_HEAD = (
+    '<html><head><meta charset="utf-8"><style>{css}</style></head><body><div class="wrap">'
+    "<h1>📢 Regulatory News Summary</h1>"
+    '<div class="summary"><p><strong>Time Window:</strong> {time_window}</p>'
+    "<p><strong>Total Articles:</strong> {total}</p>"
+    "<p><small>Generated: {generated}</small></p></div>"
+)
+HTML_EMPTY = (
+    '<div class="empty"><h3>📭 No New Articles Found</h3>'
+    "<p>No relevant regulatory news found in the specified time window.</p></div>"
+)
+HTML_GROUP_OPEN = '<h2>{name}</h2><div class="group">'
+HTML_GROUP_CLOSE = "</div>"
+HTML_STORY = (
+    '<div class="story"><h3><a href="{url}">{headline}</a></h3>'
+    '<p class="meta"><strong>{site}</strong> • {published}</p>{snippet}{also}</div>'
+)
+HTML_SNIPPET = '<p class="snippet">{text}{more}</p>'
+HTML_MORE = '... <a href="{url}">[Read more]</a>'
+HTML_ALSO = '<p class="also">Also reported by: {links}</p>'
+HTML_LINK = '<a href="{url}">{text}</a>'
+HTML_REPEAT = '<p class="repeat">↪ <a href="{url}">{headline}</a> (see {group})</p>'
+HTML_LIST_OPEN = '<ul class="links">'
+HTML_LIST_ITEM = '<li><a href="{url}">{headline}</a></li>'
+HTML_LIST_CLOSE = "</ul>"
+HTML_OMITTED = (
+    '<p class="omitted">{count} more stories are listed in the plain-text version of this email.</p>'
+)
+HTML_FOOT = (
+    '<hr style="margin: 40px 0;"><div class="footer">'
+    "<p>This is an automated regulatory intelligence report.</p>"
+    "<p>Questions? Reply to this email.</p></div></div></body></html>"
+)
+
+
+# -----------------------
+# Helpers
+# -----------------------
+def group_title(key):
+    return key.replace("_", " & ").title()
+
+
+def snippet_of(article):
+    # (snippet text, whether the body was longer). Article records carry
+    # both, so the body is only read for plain dicts without a snippet
+    snippet = article.get("snippet")
+    if snippet is not None:
+        return " ".join(snippet.split()), bool(article.get("truncated"))
+    content = article.get("content") or ""
+    return " ".join(content[:SNIPPET_CHARS].split()), len(content) > SNIPPET_CHARS
+
+
+def count_articles(data):
+    # Stories shared between groups are the same object - count them once
+    return len({id(art) for arts in data.values() for art in arts})
+
+
+# -----------------------
+# Renderers
+# -----------------------
+def size_of(part):
+    return len(part.encode("utf-8"))
+
+
+def render_html(data, time_window, generated):
+    total = count_articles(data)
+    parts = [HTML_HEAD.format(
+        css=EMAIL_CSS, time_window=escape(time_window), total=total, generated=escape(generated)
+    )]
+    size = size_of(parts[0])
+    # Room kept for closing the open list and group, the omitted line and
+    # the footer, so the finished document never passes the budget
+    reserve = size_of(HTML_LIST_CLOSE + HTML_GROUP_CLOSE + HTML_OMITTED.format(count=total) + HTML_FOOT)
+    shown_under = {}
+    omitted = set()
+    if not total:
+        parts.append(HTML_EMPTY)
+    for key, articles in data.items():
+        name = escape(group_title(key))
+        opened = listing = False
+        for art in articles:
+            url = escape(art.get("url") or "", quote=True)
+            headline = escape(art.get("headline") or "")
+            compact = False
+            if id(art) in shown_under:
+                # Already shown under an earlier group
+                part = HTML_REPEAT.format(url=url, headline=headline, group=shown_under[id(art)])
+            elif size < HTML_CARDS_BYTES:
+                text, truncated = snippet_of(art)
+                more = HTML_MORE.format(url=url) if truncated else ""
+                also = ""
+                if art.get("other_sources"):
+                    also = HTML_ALSO.format(links=", ".join(
+                        HTML_LINK.format(url=escape(other.get("url") or "", quote=True),
+                                         text=escape(other.get("site_name") or ""))
+                        for other in art["other_sources"]
+                    ))
+                part = HTML_STORY.format(
+                    url=url, headline=headline, site=escape(art.get("site_name") or ""),
+                    published=escape(art.get("published_at") or "Recently"),
+                    snippet=HTML_SNIPPET.format(text=escape(text), more=more), also=also,
+                )
+            else:
+                # Past the card budget: headline link only
+                part = HTML_LIST_ITEM.format(url=url, headline=headline)
+                compact = True
+            if listing and not compact:
+                part = HTML_LIST_CLOSE + part
+            elif compact and not listing:
+                part = HTML_LIST_OPEN + part
+            if not opened:
+                part = HTML_GROUP_OPEN.format(name=name) + part
+            if size + size_of(part) + reserve > HTML_BUDGET_BYTES:
+                if id(art) not in shown_under:
+                    omitted.add(id(art))
+                continue
+            if id(art) not in shown_under:
+                shown_under[id(art)] = name
+            opened = True
+            listing = compact
+            parts.append(part)
+            size += size_of(part)
+        if listing:
+            parts.append(HTML_LIST_CLOSE)
+        if opened:
+            parts.append(HTML_GROUP_CLOSE)
+    omitted -= shown_under.keys()
+    if omitted:
+        parts.append(HTML_OMITTED.format(count=len(omitted)))
+    parts.append(HTML_FOOT)
+    return "".join(parts)
+
+
+def render_text(data, time_window, generated):
+    # Plain-text alternative part
+    lines = [
+        "Regulatory News Summary",
+        "=" * 23,
+        f"Time Window: {time_window}",
+        f"Total Articles: {count_articles(data)}",
+        f"Generated: {generated}",
+        "",
+    ]
+    shown_under = {}
+    if not count_articles(data):
+        lines.append("No relevant regulatory news found in the specified time window.")
+    for key, articles in data.items():
+        if not articles:
+            continue
+        name = group_title(key)
+        lines += [name, "-" * len(name)]
+        for art in articles:
+            if id(art) in shown_under:
+                lines.append(f"  -> {art.get('headline')} (see {shown_under[id(art)]})")
+                continue
+            shown_under[id(art)] = name
+            text, truncated = snippet_of(art)
+            lines.append(f"* {art.get('headline')}")
+            lines.append(f"  {art.get('site_name')} | {art.get('published_at') or 'Recently'}")
+            lines.append(f"  {art.get('url')}")
+            if text:
+                lines.append(f"  {text}{'...' if truncated else ''}")
+            if art.get("other_sources"):
+                lines.append("  Also reported by: " + ", ".join(
+                    f"{other.get('site_name')} ({other.get('url')})" for other in art["other_sources"]
+                ))
+            lines.append("")
+        lines.append("")
+    lines.append("This is an automated regulatory intelligence report. Questions? Reply to this email.")
+    return "\n".join(lines)
@@ -0,0 +1,314 @@
+import os
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# -----------------------
+# Configuration
+# -----------------------
+# Persisted between GitHub Actions runs via actions/cache (see daily_news.yml)
+CACHE_DIR = os.getenv("NEWS_CACHE_DIR", ".cache")
+CACHE_DB = os.path.join(CACHE_DIR, "news_cache.sqlite")
+
+CONTENT_CACHE_TTL_DAYS = float(os.getenv("CONTENT_CACHE_TTL_DAYS", "7"))
+CONTENT_CACHE_MAX_MB = float(os.getenv("CONTENT_CACHE_MAX_MB", "64"))
+# Reruns within this many minutes replay stored SerpAPI pages (0 disables)
+SERPAPI_CACHE_MINUTES = float(os.getenv("SERPAPI_CACHE_MINUTES", "90"))
+# Delivered stories are remembered per recipient this long (0 resends all)
+SEEN_RETENTION_DAYS = float(os.getenv("SEEN_RETENTION_DAYS", "14"))
+# Extractor stats are halved once a domain passes this many attempts, so
+# recent runs outweigh old ones
+EXTRACTOR_STATS_WINDOW = 50
+
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "mc_cid", "mc_eid", "igshid",
+    "ref", "ref_src", "from", "source", "cmpid", "ito", "ocid",
+}
+
+
+# -----------------------
+# Helper: URL normalisation
+# -----------------------
+def normalize_url(url):
+    parts = urlsplit((url or "").strip())
+    scheme = parts.scheme.lower() or "https"
+    if scheme == "http":
+        scheme = "https"
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = [
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith("utm_") and name.lower() not in TRACKING_PARAMS
+    ]
+    return urlunsplit((scheme, host, path, urlencode(sorted(query)), ""))
+
+
+# -----------------------
+# SQLite store shared by the pipeline
+# -----------------------
+class NewsStore:
+    def __init__(self, path=CACHE_DB, ttl_days=CONTENT_CACHE_TTL_DAYS, max_mb=CONTENT_CACHE_MAX_MB,
+                 seen_days=SEEN_RETENTION_DAYS):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.ttl_seconds = ttl_days * 86400
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.seen_seconds = seen_days * 86400
+        self.lock = threading.Lock()
+        self.stats = Counter()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS articles (
+                url_key TEXT PRIMARY KEY,
+                url TEXT,
+                headline TEXT,
+                author TEXT,
+                site_name TEXT,
+                published_at TEXT,
+                content TEXT,
+                extractor TEXT,
+                fetched_at REAL,
+                size INTEGER
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS articles_fetched_at ON articles (fetched_at)")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS serp_responses (
+                params_key TEXT PRIMARY KEY,
+                news_results TEXT,
+                fetched_at REAL
+            )
+            """
+        )
+        # What each recipient has already been sent: kind is "url" (hash of
+        # the canonical URL) or "fingerprint" (SimHash of the body, as hex)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS delivered (
+                recipient TEXT,
+                kind TEXT,
+                key TEXT,
+                delivered_at REAL,
+                PRIMARY KEY (recipient, kind, key)
+            )
+            """
+        )
+        # Per-domain extractor outcomes, learned across runs
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS extractor_stats (
+                domain TEXT,
+                extractor TEXT,
+                attempts REAL,
+                successes REAL,
+                total_seconds REAL,
+                total_chars REAL,
+                updated_at REAL,
+                PRIMARY KEY (domain, extractor)
+            )
+            """
+        )
+        self.conn.commit()
+        self.prune()
+
+    # === Article content cache ===
+    def get_article(self, url):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT url, headline, author, site_name, published_at, content, extractor, fetched_at "
+                "FROM articles WHERE url_key = ?",
+                (normalize_url(url),),
+            ).fetchone()
+            fresh = row is not None and time.time() - row[7] <= self.ttl_seconds
+            self.stats["content_hit" if fresh else "content_miss"] += 1
+        if not fresh:
+            return None
+        return {
+            "headline": row[1],
+            "author": row[2],
+            "site_name": row[3],
+            "content": row[5],
+            "url": row[0],
+            "published_at": row[4],
+            "extractor": row[6],
+        }
+
+    def get_content(self, url):
+        # Body of an article extracted this run (see news_article.Article);
+        # no TTL check and not counted as a cache lookup
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT content FROM articles WHERE url_key = ?", (normalize_url(url),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put_article(self, url, article, extractor):
+        content = article.get("content") or ""
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO articles "
+                "(url_key, url, headline, author, site_name, published_at, content, extractor, fetched_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    normalize_url(url),
+                    article.get("url") or url,
+                    article.get("headline"),
+                    article.get("author"),
+                    article.get("site_name"),
+                    article.get("published_at"),
+                    content,
+                    extractor,
+                    time.time(),
+                    len(content.encode("utf-8")),
+                ),
+            )
+            self.conn.commit()
+
+    # === SerpAPI response cache ===
+    @staticmethod
+    def serp_params_key(params):
+        return json.dumps(
+            {name: value for name, value in params.items() if name != "api_key"}, sort_keys=True
+        )
+
+    def get_serp_results(self, params, max_age_minutes=SERPAPI_CACHE_MINUTES):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT news_results, fetched_at FROM serp_responses WHERE params_key = ?",
+                (self.serp_params_key(params),),
+            ).fetchone()
+            fresh = row is not None and time.time() - row[1] <= max_age_minutes * 60
+            self.stats["serp_hit" if fresh else "serp_miss"] += 1
+        if not fresh:
+            return None
+        return json.loads(row[0])
+
+    def put_serp_results(self, params, news_results):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO serp_responses (params_key, news_results, fetched_at) VALUES (?, ?, ?)",
+                (self.serp_params_key(params), json.dumps(news_results), time.time()),
+            )
+            self.conn.commit()
+
+    # === Delivered stories (per recipient) ===
+    def get_delivered(self, recipient):
+        # (url hashes, fingerprints) sent to this recipient within retention
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT kind, key FROM delivered WHERE recipient = ? AND delivered_at >= ?",
+                (recipient.strip().lower(), time.time() - self.seen_seconds),
+            ).fetchall()
+        url_hashes = [key for kind, key in rows if kind == "url"]
+        fingerprints = [int(key, 16) for kind, key in rows if kind == "fingerprint"]
+        return url_hashes, fingerprints
+
+    def mark_delivered(self, recipient, url_hashes, fingerprints):
+        now = time.time()
+        recipient = recipient.strip().lower()
+        rows = [(recipient, "url", key, now) for key in url_hashes]
+        rows += [(recipient, "fingerprint", format(fp, "016x"), now) for fp in fingerprints]
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO delivered (recipient, kind, key, delivered_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self.conn.commit()
+
+    # === Extractor statistics (per domain) ===
+    def record_extraction(self, domain, extractor, ok, seconds, chars=0):
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO extractor_stats "
+                "(domain, extractor, attempts, successes, total_seconds, total_chars, updated_at) "
+                "VALUES (?, ?, 1, ?, ?, ?, ?) "
+                "ON CONFLICT (domain, extractor) DO UPDATE SET "
+                "attempts = attempts + 1, successes = successes + excluded.successes, "
+                "total_seconds = total_seconds + excluded.total_seconds, "
+                "total_chars = total_chars + excluded.total_chars, updated_at = excluded.updated_at",
+                (domain, extractor, 1 if ok else 0, seconds, chars if ok else 0, time.time()),
+            )
+            self.conn.execute(
+                "UPDATE extractor_stats SET attempts = attempts / 2, successes = successes / 2, "
+                "total_seconds = total_seconds / 2, total_chars = total_chars / 2 "
+                "WHERE domain = ? AND extractor = ? AND attempts > ?",
+                (domain, extractor, EXTRACTOR_STATS_WINDOW),
+            )
+            self.conn.commit()
+
+    def get_extractor_stats(self):
+        # {domain: {extractor: {attempts, success_rate, mean_seconds, mean_chars}}}
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT domain, extractor, attempts, successes, total_seconds, total_chars FROM extractor_stats"
+            ).fetchall()
+        stats = {}
+        for domain, extractor, attempts, successes, seconds, chars in rows:
+            stats.setdefault(domain, {})[extractor] = {
+                "attempts": attempts,
+                "success_rate": successes / attempts if attempts else 0.0,
+                "mean_seconds": seconds / attempts if attempts else 0.0,
+                "mean_chars": chars / successes if successes else 0.0,
+            }
+        return stats
+
+    def report(self):
+        print(
+            f"[Cache] SerpAPI: {self.stats['serp_hit']} hits / {self.stats['serp_miss']} misses | "
+            f"Content: {self.stats['content_hit']} hits / {self.stats['content_miss']} misses"
+        )
+
+    def prune(self):
+        # Drop expired entries, then the oldest ones until under the size cap
+        with self.lock:
+            expired = self.conn.execute(
+                "DELETE FROM articles WHERE fetched_at < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+            # SerpAPI pages are only replayed within minutes; keep a day at most
+            self.conn.execute("DELETE FROM serp_responses WHERE fetched_at < ?", (time.time() - 86400,))
+            self.conn.execute("DELETE FROM delivered WHERE delivered_at < ?", (time.time() - self.seen_seconds,))
+            evicted = 0
+            total = 0
+            stale = []
+            for url_key, size in self.conn.execute(
+                "SELECT url_key, size FROM articles ORDER BY fetched_at DESC"
+            ):
+                total += size or 0
+                if total > self.max_bytes:
+                    stale.append((url_key,))
+            if stale:
+                self.conn.executemany("DELETE FROM articles WHERE url_key = ?", stale)
+                evicted = len(stale)
+            self.conn.commit()
+        if expired or evicted:
+            print(f"[Cache] Pruned {expired} expired and {evicted} oversize entries")
+
+    def close(self):
+        with self.lock:
+            self.conn.commit()
+            self.conn.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = NewsStore()
+    return _store
@@ -1,13 +1,31 @@
 import requests
 import trafilatura
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, time as dtime
 import pytz
 import time
 import json
 import os
-import random
+import argparse
+import hashlib
+import threading
+import itertools
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
-import smtplib
+from news_http import http_get, rate_limiter
+from news_store import get_store
+from news_metrics import metrics
+from news_mailer import get_mailer
+from news_render import render_html, render_text, count_articles
+from news_article import Article
+from news_checkpoint import RunCheckpoint
+from news_config import load_config, window_hours, enabled_briefings, briefing_keywords
+from news_dedupe import ArticleIndex, SeenSet, simhash, cluster_articles, url_hash, url_domain
+from news_dates import parse_result_date
+from news_keywords import (
+    MAX_QUERY_WORDS, MIN_RELEVANCE_SCORE, keyword_groups, group_key, build_keyword_query, pack_keywords,
+    get_keyword_matcher, relevance_score,
+)
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
@@ -16,19 +34,10 @@ load_dotenv()
 # -----------------------
 # Configuration
 # -----------------------
-BASE_KEYWORDS = [
-    # "regulation", "compliance"
-    "regulation", "compliance", "SEBI", "RBI", "audit", "regulatory", "FEMA", "tax", "GST",
-    "statutory", "law", "legal", "enforcement", "guideline", "notification", "amendment",
-    "disclosure", "reporting", "KYC", "AML", "insider trading", "corporate governance",
-    "penalty", "IRDA", "NFRA", "ICAI", "FDI", "income tax"
-]
-NEW_MEMBER_EXTRA_KEYWORDS = [
-    # "fraud", "case"
-    "fraud", "case", "scam", "concession", "waiver", "relief", "exemption", 
-    "violation", "breach", "investigation", "probe", "lawsuit", "litigation"
-]
-KEYWORDS_NEW_MEMBER = BASE_KEYWORDS + NEW_MEMBER_EXTRA_KEYWORDS
+# Briefings, keyword sets, time windows and sources (briefings.json)
+CONFIG = load_config()
+NEWS_SITES = CONFIG["sources"]
+SITE_FILTER = " OR ".join(f"site:{site}" for site in NEWS_SITES)
 
 SERP_API_KEYS = [
     os.getenv("SERPAPI_KEY1"),
@@ -45,54 +54,586 @@ DIFFBOT_KEYS = [
     os.getenv("DIFFBOT_TOKEN3")
 ]
 
+# Endpoints can be pointed at local stubs (see benchmarks/)
+SERPAPI_URL = os.getenv("SERPAPI_URL", "https://serpapi.com/search")
+SERPAPI_ACCOUNT_URL = os.getenv("SERPAPI_ACCOUNT_URL", "https://serpapi.com/account")
+DIFFBOT_ARTICLE_URL = os.getenv("DIFFBOT_ARTICLE_URL", "https://api.diffbot.com/v3/article")
+
+# SMTP override; without SMTP_HOST the server is picked from the sender
+SMTP_HOST = os.getenv("SMTP_HOST")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "1") != "0"
+
+# SerpAPI paging: results per page, and how deep one query may go
+SERPAPI_PAGE_SIZE = 20
+SERPAPI_MAX_PAGES = 5
+
+# Extraction worker threads per results page (per-host limits live in news_http)
+EXTRACT_WORKERS = 8
+
+# SerpAPI budgets per key: sustained requests/sec, burst size, and the
+# monthly quota assumed when the account endpoint can't be reached
+SERPAPI_REQUESTS_PER_SEC = 1.0
+SERPAPI_BURST = 2
+SERPAPI_MONTHLY_QUOTA = int(os.getenv("SERPAPI_MONTHLY_QUOTA", "250"))
+
+# Run-wide Diffbot fallback workers (news_http caps the host at 3 anyway)
+DIFFBOT_WORKERS = 3
+
+# Extractor routing: once trafilatura has ROUTE_MIN_ATTEMPTS results for a
+# domain and succeeds less than ROUTE_MIN_SUCCESS of the time, send that
+# domain to Diffbot first. Every ROUTE_EXPLORE_EVERY-th URL still tries
+# trafilatura first so a recovered domain is noticed.
+ROUTE_MIN_ATTEMPTS = 5
+ROUTE_MIN_SUCCESS = 0.25
+ROUTE_EXPLORE_EVERY = 10
+
+# -----------------------
+# Helper: Token bucket rate budget
+# -----------------------
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self):
+        # Seconds until one token is available (0 if available now)
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        self._refill()
+        self.tokens -= 1
+
+
+# -----------------------
+# Helper: SerpAPI key pool with per-key budgets
+# -----------------------
+class SerpKeyPool:
+    def __init__(self, keys, rate=SERPAPI_REQUESTS_PER_SEC, burst=SERPAPI_BURST,
+                 monthly_quota=SERPAPI_MONTHLY_QUOTA, check_account=False):
+        self.keys = [key for key in keys if key]
+        self.buckets = {key: TokenBucket(rate, burst) for key in self.keys}
+        self.remaining = {key: monthly_quota for key in self.keys}
+        self.lock = threading.Lock()
+        if check_account:
+            self.refresh_quota()
+
+    def refresh_quota(self):
+        # The account endpoint is free and reports searches left this month
+        for number, key in enumerate(self.keys, start=1):
+            try:
+                response = http_get(SERPAPI_ACCOUNT_URL, params={"api_key": key}, timeout=(5, 10))
+                response.raise_for_status()
+                left = response.json().get("total_searches_left")
+                if left is not None:
+                    self.remaining[key] = int(left)
+                print(f"[SerpAPI] Key {number}: {self.remaining[key]} searches left")
+            except Exception as e:
+                print(f"[SerpAPI] Key {number}: quota check failed ({e}), assuming {self.remaining[key]}")
+
+    def number(self, key):
+        return self.keys.index(key) + 1
+
+    def scope(self, key):
+        # Rate-limiter scope for this key (never logs the key itself)
+        return f"serpapi:{self.number(key)}"
+
+    def acquire(self, preferred=0):
+        # Block until a key with quota left has a token and is not backing
+        # off after 429/5xx; prefer keys in rotation order starting at
+        # `preferred`. Returns None when every key is exhausted.
+        if not self.keys:
+            return None
+        while True:
+            with self.lock:
+                order = [self.keys[(preferred + i) % len(self.keys)] for i in range(len(self.keys))]
+                usable = [key for key in order if self.remaining[key] > 0]
+                if not usable:
+                    return None
+                waits = [
+                    (max(self.buckets[key].wait_time(), rate_limiter.delay(self.scope(key))), key)
+                    for key in usable
+                ]
+                wait, key = min(waits, key=lambda item: item[0])
+                if wait == 0:
+                    self.buckets[key].take()
+                    self.remaining[key] -= 1
+                    return key
+            time.sleep(wait)
+            metrics.observe("serpapi_key_wait", wait)
+
+    def exhaust(self, key):
+        with self.lock:
+            self.remaining[key] = 0
+
+
+_serp_key_pool = None
+_serp_key_pool_lock = threading.Lock()
+
+
+def get_serp_key_pool():
+    global _serp_key_pool
+    with _serp_key_pool_lock:
+        if _serp_key_pool is None:
+            _serp_key_pool = SerpKeyPool(SERP_API_KEYS, check_account=True)
+    return _serp_key_pool
+
+
+# -----------------------
+# Helper: Diffbot fallback queue with token health
+# -----------------------
+class DiffbotPool:
+    # Pages trafilatura could not extract are queued here from every
+    # extraction worker and sent to Diffbot concurrently. Tokens that fail
+    # auth or run out of quota are retired for the rest of the run.
+    def __init__(self, tokens, workers=DIFFBOT_WORKERS):
+        self.tokens = [token for token in tokens if token]
+        self.retired = {}  # token -> reason
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+        self.workers = workers
+        self.executor = None
+        self.queued = 0
+        self.extracted = 0
+
+    def number(self, token):
+        return self.tokens.index(token) + 1
+
+    def scope(self, token):
+        return f"diffbot:{self.number(token)}"
+
+    def acquire(self):
+        # Next healthy token in rotation, preferring one that is not backing
+        # off; None once every token is retired
+        while True:
+            with self.lock:
+                healthy = [token for token in self.tokens if token not in self.retired]
+                if not healthy:
+                    return None
+                start = next(self.counter)
+                order = [healthy[(start + i) % len(healthy)] for i in range(len(healthy))]
+                wait, token = min(
+                    ((rate_limiter.delay(self.scope(token)), token) for token in order),
+                    key=lambda item: item[0],
+                )
+            if wait == 0:
+                return token
+            time.sleep(wait)
+            metrics.observe("diffbot_token_wait", wait)
+
+    def retire(self, token, reason):
+        with self.lock:
+            if token in self.retired:
+                return
+            self.retired[token] = reason
+            left = len(self.tokens) - len(self.retired)
+        print(f"[Diffbot] Token {self.number(token)} retired ({reason}), {left} left")
+
+    def submit(self, url, published_at=None):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers)
+            self.queued += 1
+        return self.executor.submit(self.extract, url, published_at)
+
+    def extract(self, url, published_at=None):
+        # A retired token only costs a retry on the next healthy one
+        for _ in range(max(1, len(self.tokens))):
+            token = self.acquire()
+            if token is None:
+                print(f"[Diffbot] No healthy tokens left, skipping {url}")
+                return None
+            result = fetch_diffbot_content(
+                url, token, published_at=published_at, scope=self.scope(token), on_bad_token=self.retire
+            )
+            if result is not None:
+                with self.lock:
+                    self.extracted += 1
+                return result
+            if token not in self.retired:
+                return None
+        return None
+
+    def report(self):
+        if self.queued:
+            print(
+                f"[Diffbot] Fallbacks: {self.queued} queued, {self.extracted} extracted, "
+                f"{len(self.retired)}/{len(self.tokens)} tokens retired"
+            )
+
+
+_diffbot_pool = None
+_diffbot_pool_lock = threading.Lock()
+
+
+def get_diffbot_pool():
+    global _diffbot_pool
+    with _diffbot_pool_lock:
+        if _diffbot_pool is None:
+            _diffbot_pool = DiffbotPool(DIFFBOT_KEYS)
+    return _diffbot_pool
+
+
+# -----------------------
+# Helper: Per-domain extractor routing
+# -----------------------
+class ExtractorRouter:
+    # Picks the cheapest extractor likely to succeed for a domain from the
+    # stats persisted by earlier runs. trafilatura is free, so it goes first
+    # unless it keeps failing there and Diffbot does better.
+    def __init__(self, stats):
+        self.stats = stats
+        self.lock = threading.Lock()
+        self.seen = Counter()
+        self.announced = set()
+
+    def choose(self, url):
+        domain = url_domain(url)
+        stats = self.stats.get(domain, {})
+        traf = stats.get("trafilatura")
+        diff = stats.get("diffbot")
+        if not traf or traf["attempts"] < ROUTE_MIN_ATTEMPTS or traf["success_rate"] >= ROUTE_MIN_SUCCESS:
+            return "trafilatura"
+        if diff and diff["attempts"] >= ROUTE_MIN_ATTEMPTS and diff["success_rate"] <= traf["success_rate"]:
+            return "trafilatura"
+        with self.lock:
+            self.seen[domain] += 1
+            explore = self.seen[domain] % ROUTE_EXPLORE_EVERY == 0
+            announce = domain not in self.announced
+            self.announced.add(domain)
+        if announce:
+            print(
+                f"[Router] {domain}: Diffbot first (trafilatura {traf['success_rate']:.0%} "
+                f"of {traf['attempts']:.0f}, {traf['mean_seconds']:.1f}s avg)"
+            )
+        return "trafilatura" if explore else "diffbot"
+
+
+_extractor_router = None
+_extractor_router_lock = threading.Lock()
+
+
+def get_extractor_router():
+    global _extractor_router
+    with _extractor_router_lock:
+        if _extractor_router is None:
+            _extractor_router = ExtractorRouter(get_store().get_extractor_stats())
+    return _extractor_router
+
+
 # -----------------------
 # Helper: Enhanced Content Fetching
 # -----------------------
-def fetch_article_content(url):
+def fetch_article_content(url, headline=None, site_name=None, published_at=None):
     try:
-        # Add random delay to avoid rate limiting
-        time.sleep(random.uniform(1, 3))
-        downloaded = trafilatura.fetch_url(url)
-        if downloaded:
-            content = trafilatura.extract(downloaded)
-            if content and len(content.strip()) > 50:  # Valid content
-                return content.strip()
+        # Repeat URLs (earlier pair or earlier run) come from the local cache
+        cached = get_store().get_article(url)
+        if cached and cached["content"]:
+            print(f"[Cache] Content hit for {url}")
+            metrics.count("content_cache_hits")
+            return cached["content"]
+
+        # Download over the pooled session (per-host limit applies),
+        # extract outside of it
+        started = time.monotonic()
+        content = None
+        try:
+            response = http_get(url)
+            downloaded = response.content if response.ok else None
+            if downloaded:
+                content = (trafilatura.extract(downloaded) or "").strip()
+        finally:
+            # Outcome feeds the per-domain extractor router on later runs
+            ok = bool(content) and len(content) > 100
+            elapsed = time.monotonic() - started
+            get_store().record_extraction(url_domain(url), "trafilatura", ok, elapsed, len(content or ""))
+            metrics.observe("trafilatura", elapsed)
+            metrics.count("trafilatura_ok" if ok else "trafilatura_failed")
+        if content and len(content) > 50:  # Valid content
+            get_store().put_article(url, {
+                "headline": headline,
+                "site_name": site_name,
+                "content": content,
+                "url": url,
+                "published_at": published_at,
+            }, extractor="trafilatura")
+            return content
         return None
     except Exception as e:
         print(f"[Content Fetch Error] {e} for URL: {url}")
         return None
 
 
-def fetch_diffbot_content(url, token, max_retries=3, sleep_seconds=5):
+def fetch_diffbot_content(url, token, max_retries=3, published_at=None, scope=None, on_bad_token=None):
+    # Only spend Diffbot tokens on pages we have not extracted before
+    cached = get_store().get_article(url)
+    if cached and len(cached["content"] or "") >= 100:
+        print(f"[Cache] Diffbot hit for {url}")
+        metrics.count("content_cache_hits")
+        cached.pop("extractor", None)
+        return cached
+
+    # Backoff is tracked per token; retries only wait if the token is
+    # actually being throttled
+    if scope is None and token in DIFFBOT_KEYS:
+        scope = f"diffbot:{DIFFBOT_KEYS.index(token) + 1}"
+    started = time.monotonic()
+
+    def record(ok, chars=0):
+        # Only called for an actual article response: token problems,
+        # throttling and transport errors say nothing about the domain
+        get_store().record_extraction(url_domain(url), "diffbot", ok, time.monotonic() - started, chars)
+        metrics.count("diffbot_ok" if ok else "diffbot_failed")
+
     for attempt in range(max_retries):
         try:
-            time.sleep(random.uniform(2, 4))  # Random delay
-            api_url = f"https://api.diffbot.com/v3/article?url={url}&token={token}"
-            response = requests.get(api_url, timeout=20)
+            metrics.count("diffbot_credits")  # Diffbot bills every call
+            with metrics.timer("diffbot_request"):
+                response = http_get(DIFFBOT_ARTICLE_URL, params={"url": url, "token": token}, scope=scope)
             data = response.json()
-            
+
+            # Diffbot reports token problems in the body as well as the status
+            error_code = data.get("errorCode") or response.status_code
+            error = str(data.get("error", "")).lower()
+            if error_code in (401, 403) or ("token" in error and "not authorized" in error):
+                if on_bad_token:
+                    on_bad_token(token, "not authorized")
+                return None
+            if error_code == 402 or (error_code == 429 and ("exceeded" in error or "quota" in error)):
+                if on_bad_token:
+                    on_bad_token(token, "quota exhausted")
+                return None
+            if error_code == 429 or error_code >= 500:
+                print(f"[Diffbot] HTTP {error_code} on attempt {attempt + 1} for {url}")
+                continue  # The rate limiter holds the next attempt back
+
             if "objects" not in data or not data["objects"]:
                 print(f"[Diffbot] No objects for {url}")
+                record(False)
                 return None
-                
+
             article = data["objects"][0]
             content = article.get("text", "")
             if not content or len(content.strip()) < 100:
+                record(False)
                 return None
-                
-            return {
+
+            result = {
                 "headline": article.get("title"),
                 "author": article.get("author"),
                 "site_name": article.get("siteName"),
                 "content": content.strip(),
                 "url": article.get("pageUrl"),
             }
+            get_store().put_article(url, {**result, "published_at": published_at}, extractor="diffbot")
+            record(True, len(result["content"]))
+            return result
         except Exception as e:
             print(f"[Diffbot Error] Attempt {attempt + 1}: {e}")
-            time.sleep(sleep_seconds)
+    metrics.count("diffbot_failed")  # Retries used up; not a domain outcome
     return None
 
 
+# -----------------------
+# Helper: Extract one in-window search result
+# -----------------------
+def extract_article(link, title, source_name, pub_dt):
+    # trafilatura only; Diffbot is chained on by extract_routed
+    published_at = pub_dt.strftime("%Y-%m-%d %H:%M IST")
+
+    content = fetch_article_content(link, headline=title, site_name=source_name, published_at=published_at)
+    if content and len(content) > 100:
+        print(f"[SUCCESS] Extracted {title[:60]}...")
+        return {
+            "headline": title,
+            "author": None,
+            "site_name": source_name,
+            "content": content,
+            "url": link,
+            "published_at": published_at,
+            "fingerprint": simhash(content),
+        }
+    return None
+
+
+def extract_routed(pool, link, title, source_name, pub_dt, diffbot_pool, router=None):
+    # Future for the finished article. The router picks which extractor
+    # goes first for this domain and the other one is the fallback; each
+    # step releases its worker as soon as it is done, so a Diffbot call
+    # never holds an extraction thread.
+    result = Future()
+    published_at = pub_dt.strftime("%Y-%m-%d %H:%M IST")
+    order = ["trafilatura"]
+    if diffbot_pool is not None and diffbot_pool.tokens:
+        order.append("diffbot")
+        if router is not None and router.choose(link) == "diffbot":
+            order.reverse()
+            metrics.count("routed_to_diffbot")
+
+    def attempt(index):
+        if order[index] == "trafilatura":
+            future = pool.submit(extract_article, link, title, source_name, pub_dt)
+        else:
+            future = diffbot_pool.submit(link, published_at)
+        future.add_done_callback(lambda future: done(index, future))
+
+    def done(index, future):
+        try:
+            article = future.result()
+        except Exception as e:
+            print(f"[{order[index]} Error] {e} for URL: {link}")
+            article = None
+        if article and order[index] == "diffbot":
+            article["published_at"] = published_at
+            article["fingerprint"] = simhash(article["content"])
+            print(f"[DIFFBOT] Extracted {title[:60]}...")
+        if article or index + 1 == len(order):
+            if not article:
+                print(f"[CONTENT FAIL] {' & '.join(order)} failed for {link}")
+            metrics.count("extracted" if article else "extraction_failed")
+            # Keep only a compact record; the body is already in the store
+            result.set_result(Article.from_extracted(article, link) if article else None)
+            return
+        metrics.count("fallbacks")
+        attempt(index + 1)
+
+    attempt(0)
+    return result
+
+
+def extract_articles(candidates, diffbot_pool, article_index=None, router=None):
+    # Download and extract all in-window links of a page concurrently;
+    # results keep the order of the SerpAPI page. With a run-wide
+    # article_index, a story already claimed by another pair (same canonical
+    # URL or headline) is not fetched again - the same article dict is
+    # attached to this pair by reference.
+    if not candidates:
+        return []
+
+    workers = min(EXTRACT_WORKERS, len(candidates))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for link, title, source_name, pub_dt in candidates:
+            def submit(link=link, title=title, source_name=source_name, pub_dt=pub_dt):
+                return extract_routed(pool, link, title, source_name, pub_dt, diffbot_pool, router)
+            if article_index is None:
+                futures.append(submit())
+            else:
+                futures.append(article_index.claim(link, title, source_name, submit))
+        extracted = [future.result() for future in futures]
+
+    articles = []
+    seen = set()
+    for article in extracted:
+        if article and id(article) not in seen:
+            seen.add(id(article))
+            articles.append(article)
+    return articles
+
+
+# -----------------------
+# Helper: Time windows
+# -----------------------
+# Windows in IST: (days back from the run date, start hour, end hour)
+TIME_WINDOW_HOURS = window_hours(CONFIG)
+
+
+class TimeWindow:
+    def __init__(self, mode, day, start, end):
+        self.mode = mode
+        self.day = day  # IST calendar day
+        self.start = start  # UTC, inclusive
+        self.end = end  # UTC, exclusive
+        self.start_ts = start.timestamp()
+        self.end_ts = end.timestamp()
+
+    def contains(self, pub_dt):
+        return self.start <= pub_dt < self.end
+
+
+def build_time_windows(now_ist):
+    ist = pytz.timezone("Asia/Kolkata")
+    windows = {}
+    for mode, (days_back, start_hour, end_hour) in TIME_WINDOW_HOURS.items():
+        day = (now_ist - timedelta(days=days_back)).date()
+        start = ist.localize(datetime.combine(day, dtime(start_hour))).astimezone(pytz.UTC)
+        # Offset from midnight, so end_hour 24 is the next midnight
+        end = ist.localize(datetime.combine(day, dtime(0)) + timedelta(hours=end_hour)).astimezone(pytz.UTC)
+        windows[mode] = TimeWindow(mode, day, start, end)
+    return windows
+
+
+_time_windows = None
+
+
+def init_time_windows(now_ist):
+    global _time_windows
+    _time_windows = build_time_windows(now_ist)
+    return _time_windows
+
+
+def get_time_windows():
+    # Built once per run, from the first call's clock, so every page and
+    # every briefing filters against the same boundaries
+    if _time_windows is None:
+        return init_time_windows(datetime.now(pytz.timezone("Asia/Kolkata")))
+    return _time_windows
+
+
+def in_time_window(pub_dt, time_filter_mode):
+    window = get_time_windows().get(time_filter_mode)
+    return window is not None and window.contains(pub_dt)
+
+
+def serp_date_range(modes):
+    # One tbs value covering exactly the IST days of the requested windows
+    # (Google expects cdr dates as M/D/YYYY)
+    windows = get_time_windows()
+    days = [windows[mode].day for mode in modes if mode in windows]
+    if not days:
+        return "qdr:d"
+    cd_min = min(days).strftime("%m/%d/%Y")
+    cd_max = max(days).strftime("%m/%d/%Y")
+    print(f"[DEBUG] Date range: {cd_min} → {cd_max}")
+    return f"cdr:1,cd_min:{cd_min},cd_max:{cd_max}"
+
+
+def prefilter_results(news_results, modes):
+    # One pass over the whole page before anything is scheduled: drop
+    # incomplete items and everything outside the windows by comparing
+    # timestamps against the precomputed bounds. Also returns the oldest
+    # timestamp on the page (None if nothing was dated) for paging.
+    ist = pytz.timezone("Asia/Kolkata")
+    windows = get_time_windows()
+    bounds = [(windows[mode].start_ts, windows[mode].end_ts) for mode in modes if mode in windows]
+
+    items = [item for item in news_results if item.get("link") and item.get("title")]
+    now = datetime.now(pytz.UTC)  # Reference for relative dates ("3 hours ago")
+    parsed = [(item, parse_result_date(item, now)) for item in items]
+    stamps = [(item, pub_dt, pub_dt.timestamp()) for item, pub_dt in parsed if pub_dt is not None]
+    candidates = [
+        (item["link"], item["title"], (item.get("source") or {}).get("name", "Unknown"), pub_dt.astimezone(ist))
+        for item, pub_dt, ts in stamps
+        if any(start <= ts < end for start, end in bounds)
+    ]
+    print(
+        f"[FILTER] {len(candidates)}/{len(news_results)} results in window "
+        f"({len(news_results) - len(items)} incomplete, {len(items) - len(stamps)} undated)"
+    )
+    oldest = min((ts for _, _, ts in stamps), default=None)
+    return candidates, oldest
+
+
 # -----------------------
 # Enhanced SerpAPI News Fetching
 # -----------------------
@@ -100,48 +641,61 @@ def fetch_serpapi_news(
     query,
     serp_keys,
     diffbot_keys,
-    time_filter_mode="today_7_to_10",
+    time_filter_mode="today_7_to_10",  # One mode or a list of modes
     max_retries=5,  # Increased retries
-    sleep_seconds=8,  # Increased delay
     force_fresh=False,  # Force fresh results
+    key_pool=None,  # Shared SerpKeyPool; built from serp_keys if omitted
+    key_offset=0,  # Which key to try first
+    article_index=None,  # Run-wide ArticleIndex shared between pairs
+    skip=None,  # skip(link, pub_dt) -> True for already-delivered results
+    diffbot_pool=None,  # Shared DiffbotPool; built from diffbot_keys if omitted
 ):
-    ist = pytz.timezone("Asia/Kolkata")
+    results, _ = search_serpapi_news(
+        query, serp_keys, diffbot_keys, time_filter_mode, max_retries, force_fresh,
+        key_pool, key_offset, article_index, skip, diffbot_pool,
+    )
+    return results
+
+
+def search_serpapi_news(
+    query,
+    serp_keys,
+    diffbot_keys,
+    time_filter_mode="today_7_to_10",
+    max_retries=5,
+    force_fresh=False,
+    key_pool=None,
+    key_offset=0,
+    article_index=None,
+    skip=None,
+    diffbot_pool=None,
+):
+    # Returns (articles, saturated): saturated means the last allowed page
+    # was full and still newer than the window start, so the query hit the
+    # result cap before covering the whole window
+    started = time.monotonic()
     results = []
-    serp_index = 0
-    diffbot_index = 0
+    saturated = False
+    serp_index = key_offset
+    if key_pool is None:
+        key_pool = SerpKeyPool(serp_keys)
+    if diffbot_pool is None:
+        diffbot_pool = DiffbotPool(diffbot_keys)
     total_attempts = 0
 
-    url = "https://serpapi.com/search"
-    
     # Enhanced base query with more sites and better parameters
     params_base = {
         "engine": "google_news",
-        "q": (
-            "site:economictimes.indiatimes.com "
-            "OR site:business-standard.com "
-            "OR site:financialexpress.com "
-            "OR site:moneycontrol.com "
-            "OR site:livemint.com "
-            f"{query}"
-        ),
+        "q": f"{SITE_FILTER} {query}",
         "hl": "en",
         "gl": "in",
         "lr": "lang_en",  # English language
-        "num": "20",  # Get more results
+        "num": str(SERPAPI_PAGE_SIZE),  # Results per page
     }
 
-    # Set date range based on mode
-    if time_filter_mode == "today_7_to_10":
-        params_base["tbs"] = "qdr:d"  # today only
-    elif time_filter_mode == "yesterday_7am_to_12pm":
-        # Use specific date range for yesterday
-        now_ist = datetime.now(ist)
-        yesterday = now_ist - timedelta(days=1)
-        yesterday_str = yesterday.strftime("%Y-%m-%d")
-        params_base["tbs"] = f"cdr:1,cd_min:{yesterday_str},cd_max:{yesterday_str}"
-        print(f"[DEBUG] Yesterday date range: {yesterday_str}")
-    else:
-        params_base["tbs"] = "qdr:d"
+    # Set date range covering every requested window
+    modes = [time_filter_mode] if isinstance(time_filter_mode, str) else list(time_filter_mode)
+    params_base["tbs"] = serp_date_range(modes)
 
     # Add cache-busting parameter
     if force_fresh:
@@ -149,20 +703,85 @@ def fetch_serpapi_news(
 
     print(f"[DEBUG] Query: {query} | Mode: {time_filter_mode} | TBS: {params_base.get('tbs', 'N/A')}")
 
+    windows = get_time_windows()
+    window_start = min((windows[mode].start_ts for mode in modes if mode in windows), default=0.0)
+
+    for page in range(SERPAPI_MAX_PAGES):
+        page_params = params_base if page == 0 else {**params_base, "start": str(page * SERPAPI_PAGE_SIZE)}
+        news_results, serp_index, attempts = fetch_serpapi_page(
+            page_params, key_pool, serp_index, max_retries, f"{query} | page {page + 1}"
+        )
+        total_attempts += attempts
+        if not news_results:
+            break
+
+        # === Time Filtering (whole page, before any extraction) ===
+        candidates, oldest = prefilter_results(news_results, modes)
+        metrics.count("serp_results", len(news_results))
+        metrics.count("in_window", len(candidates))
+        for link, title, source_name, pub_dt in candidates:
+            print(f"[PROCESS] {title[:60]}... | {pub_dt.strftime('%H:%M IST')} | {source_name}")
+
+        # === Skip already-delivered stories before downloading them ===
+        to_extract = candidates
+        if skip is not None:
+            to_extract = [c for c in candidates if not skip(c[0], c[3])]
+            if len(to_extract) < len(candidates):
+                print(f"[SEEN] Skipping {len(candidates) - len(to_extract)} already-delivered results")
+                metrics.count("skipped_delivered", len(candidates) - len(to_extract))
+
+        # === Fetch Content (concurrently) ===
+        # (extract_routed already falls back across extractors, and failed
+        # claims stay cached in the index, so there is no second pass)
+        articles = extract_articles(to_extract, diffbot_pool, article_index, get_extractor_router())
+        results.extend(articles)
+        print(f"[SUMMARY] Page {page + 1}: {len(news_results)} results, kept {len(articles)} valid articles")
+
+        # === Adaptive paging: go deeper while the page was full and hasn't
+        # reached past the start of every window. A page with nothing in
+        # the window is newer than it (or a gap between windows) and is
+        # skipped, not taken as the end
+        if len(news_results) < SERPAPI_PAGE_SIZE:
+            break
+        if oldest is not None and oldest < window_start:
+            print(f"[PAGING] Page {page + 1} reached past the window start, stopping")
+            break
+        if page == SERPAPI_MAX_PAGES - 1:
+            # Out of pages before the oldest window was reached: the caller
+            # splits the query so those results aren't lost
+            print(f"[PAGING] Window start not reached after {SERPAPI_MAX_PAGES} pages - query is saturated")
+            saturated = True
+
+    print(f"[FINAL] SerpAPI requests: {total_attempts} | Results: {len(results)}")
+    metrics.observe("search_query", time.monotonic() - started)  # Paging plus extraction
+    return results, saturated
+
+
+def fetch_serpapi_page(params_base, key_pool, serp_index, max_retries, label):
+    # One results page: stored response if fresh, otherwise SerpAPI with
+    # key rotation on errors. Returns (news_results or None, next key
+    # index, network attempts made).
+    attempts = 0
     for attempt in range(max_retries):
-        total_attempts += 1
-        serp_key = serp_keys[serp_index % len(serp_keys)]
+        # Replay a stored response for the same query if it is fresh enough
+        news_results = get_store().get_serp_results(params_base)
+        if news_results is not None:
+            print(f"[Cache] SerpAPI hit for {label} ({len(news_results)} results)")
+            metrics.count("serpapi_cache_hits")
+            return news_results, serp_index, attempts
+
+        serp_key = key_pool.acquire(serp_index)
+        if serp_key is None:
+            print("[SerpAPI] All keys are out of quota")
+            return None, serp_index, attempts
         params = {**params_base, "api_key": serp_key}
 
         try:
-            # Random delay between requests
-            if attempt > 0:
-                delay = random.uniform(sleep_seconds, sleep_seconds + 3)
-                print(f"[WAIT] Sleeping {delay:.1f}s before attempt {attempt + 1}")
-                time.sleep(delay)
-
-            print(f"[SerpAPI] Attempt {attempt + 1}/{max_retries} with key {serp_index + 1}")
-            response = requests.get(url, params=params, timeout=25)
+            attempts += 1
+            print(f"[SerpAPI] {label} | Attempt {attempt + 1}/{max_retries} with key {key_pool.number(serp_key)}")
+            metrics.count("serpapi_requests")
+            with metrics.timer("serpapi_request"):
+                response = http_get(SERPAPI_URL, params=params, scope=key_pool.scope(serp_key))
             response.raise_for_status()
             data = response.json()
 
@@ -170,309 +789,484 @@ def fetch_serpapi_news(
                 print(f"[SerpAPI] Invalid response structure")
                 raise Exception("Invalid API response")
 
+            # A valid empty page is an answer too - another key would get
+            # the same one, so don't spend credits retrying it
             news_results = data.get("news_results", [])
+            metrics.count("serpapi_credits")  # Only successful searches are billed
+            get_store().put_serp_results(params_base, news_results)
             print(f"[SerpAPI] Found {len(news_results)} news results")
-
-            if not news_results:
-                print(f"[SerpAPI] No news results for query: {query}")
-                serp_index += 1
-                continue
-
-            valid_articles = 0
-            for idx, item in enumerate(news_results):
-                link = item.get("link")
-                title = item.get("title")
-                source_name = item.get("source", {}).get("name", "Unknown")
-                date_str = item.get("date")
-
-                if not link or not title or not date_str:
-                    print(f"[SKIP] Invalid item {idx}: missing link/title/date")
-                    continue
-
-                # Parse published date with better error handling
-                try:
-                    # Handle different date formats
-                    date_part = date_str.split(", +0000 UTC")[0] if ", +0000 UTC" in date_str else date_str
-                    pub_dt = datetime.strptime(date_part, "%m/%d/%Y, %I:%M %p")
-                    pub_dt = pub_dt.replace(tzinfo=pytz.UTC).astimezone(ist)
-                except ValueError:
-                    try:
-                        # Alternative format: "Dec 8, 2025, 3:30 PM"
-                        pub_dt = datetime.strptime(date_str, "%b %d, %Y, %I:%M %p")
-                        pub_dt = pub_dt.replace(tzinfo=pytz.UTC).astimezone(ist)
-                    except ValueError as e2:
-                        print(f"[Date Parse Error] {date_str} -> {e2}")
-                        continue
-
-                now_ist = datetime.now(ist)
-
-                # === Enhanced Time Filtering ===
-                keep_article = False
-                if time_filter_mode == "today_7_to_10":
-                    if pub_dt.date() == now_ist.date() and 7 <= pub_dt.hour < 10:
-                        keep_article = True
-                elif time_filter_mode == "yesterday_7am_to_12pm":
-                    yesterday = now_ist - timedelta(days=1)
-                    if (pub_dt.date() == yesterday.date() and 
-                        7 <= pub_dt.hour < 12):
-                        keep_article = True
-
-                if not keep_article:
-                    print(f"[FILTER] Skipping {title[:60]}... (outside time window)")
-                    continue
-
-                print(f"[PROCESS] {title[:60]}... | {pub_dt.strftime('%H:%M IST')} | {source_name}")
-
-                # === Fetch Content ===
-                content = fetch_article_content(link)
-                if content and len(content) > 100:
-                    article_data = {
-                        "headline": title,
-                        "author": None,
-                        "site_name": source_name,
-                        "content": content,
-                        "url": link,
-                        "published_at": pub_dt.strftime("%Y-%m-%d %H:%M IST")
-                    }
-                    results.append(article_data)
-                    valid_articles += 1
-                    print(f"[SUCCESS] Added article {valid_articles}")
-                else:
-                    # Try Diffbot as fallback
-                    diff_token = diffbot_keys[diffbot_index % len(diffbot_keys)]
-                    diffbot_index += 1
-                    diff_data = fetch_diffbot_content(link, diff_token)
-                    if diff_data:
-                        diff_data["published_at"] = pub_dt.strftime("%Y-%m-%d %H:%M IST")
-                        results.append(diff_data)
-                        valid_articles += 1
-                        print(f"[DIFFBOT] Added article {valid_articles}")
-                    else:
-                        print(f"[CONTENT FAIL] Both trafilatura & Diffbot failed for {link}")
-
-                # Rate limiting between articles
-                if valid_articles < len(news_results):  # Not the last one
-                    time.sleep(random.uniform(3, 6))
-
-            print(f"[SUMMARY] Processed {len(news_results)} results, kept {valid_articles} valid articles")
-            
-            if valid_articles > 0:
-                print(f"[SUCCESS] Returning {len(results)} articles for {query}")
-                break  # Success - exit retry loop
-            else:
-                print(f"[WARNING] No valid articles found, retrying...")
+            return news_results, serp_index, attempts
 
         except requests.exceptions.RequestException as e:
             print(f"[Network Error {attempt+1}] {e}")
+            status = getattr(e.response, "status_code", None)
+            out_of_searches = status == 429 and "run out of searches" in (e.response.text or "")
+            if status == 401 or out_of_searches:
+                # Invalid key or searches used up - stop routing to it
+                print(f"[SerpAPI] Key {key_pool.number(serp_key)} exhausted (HTTP {status})")
+                key_pool.exhaust(serp_key)
+            # Throttling (429/5xx) is handled by the rate limiter: that key
+            # backs off and the next attempt rotates to another one
             serp_index += 1
         except Exception as e:
             print(f"[SerpAPI Error {attempt+1}] {e}")
             serp_index += 1
 
-        if attempt < max_retries - 1:
-            wait_time = random.uniform(10, 15)
-            print(f"[RETRY] Waiting {wait_time:.1f}s before next attempt...")
-            time.sleep(wait_time)
-
-    print(f"[FINAL] Total attempts: {total_attempts} | Results: {len(results)}")
-    return results
+    return None, serp_index, attempts
 
 
 # -----------------------
-# Fetch for keyword pairs
+# Fetch plan shared by all briefings
 # -----------------------
-def fetch_news_for_keywords(keywords, time_filter_mode, force_fresh=False):
-    all_results = {}
-    print(f"\n🔍 Starting keyword search | Mode: {time_filter_mode} | Fresh: {force_fresh}")
-    
-    for i in range(0, len(keywords) - 1, 2):
-        k1 = keywords[i]
-        k2 = keywords[i + 1]
-        query = f'("{k1}" OR "{k2}")'  # Quote keywords for better matching
-        print(f"\n📝 Processing: {k1} OR {k2}")
-        
-        articles = fetch_serpapi_news(
-            query=query,
+def build_fetch_plan(briefings):
+    # briefings: {name: (keywords, time_filter_mode)}. Every keyword is
+    # searched once per window that needs it, each query with that
+    # window's own date range: a range spanning two windows returns the
+    # newer one's results first and the older window gets cut off. A
+    # keyword shared by two windows costs two searches, but the run-wide
+    # ArticleIndex still extracts each URL only once. Keywords of one
+    # window are packed into as few OR queries as the word limit allows.
+    window_keywords = {}
+    for keywords, time_filter_mode in briefings.values():
+        wanted = window_keywords.setdefault(time_filter_mode, [])
+        wanted += [keyword for keyword in keywords if keyword not in wanted]
+
+    word_budget = MAX_QUERY_WORDS - len(SITE_FILTER.split())
+    plan = {}
+    for time_filter_mode, keywords in window_keywords.items():
+        for packed in pack_keywords(keywords, word_budget):
+            plan[f"q{len(plan) + 1}"] = {"keywords": packed, "modes": [time_filter_mode]}
+    return plan
+
+
+def stream_fetch_plan(plan, force_fresh=False, skip=None, checkpoint=None):
+    # Search stage: yields (query key, articles) as each query finishes.
+    # Each query time-filters its page and starts extraction as soon as the
+    # page arrives; the run-wide index dedupes stories across queries.
+    # With a checkpoint, units finished by an earlier attempt are replayed
+    # from it and every newly finished unit is saved to it.
+    article_index = ArticleIndex()
+    remaining = dict(plan)
+    if checkpoint is not None:
+        for key in plan:
+            if not checkpoint.completed(key):
+                continue
+            articles = checkpoint.unit_articles(key)
+            for art in articles:
+                # Later queries attach these instead of extracting again
+                restored = Future()
+                restored.set_result(art)
+                article_index.claim(art.source_url or art.url, art.headline, art.site_name, lambda: restored)
+            del remaining[key]
+            print(f"[Resume] {key}: {len(articles)} articles restored from checkpoint")
+            yield key, articles
+        if not remaining:
+            return
+
+    key_pool = get_serp_key_pool()
+    diffbot_pool = get_diffbot_pool()
+    if not key_pool.keys:
+        print("[SerpAPI] No API keys configured")
+        for key in remaining:
+            yield key, []
+        return
+
+    # One automaton over every planned keyword, compiled once per run
+    matcher = get_keyword_matcher(
+        tuple(dict.fromkeys(keyword for unit in plan.values() for keyword in unit["keywords"]))
+    )
+    pruned = 0
+
+    def fetch_unit(index, keywords, modes):
+        print(f"\n📝 Processing: {' OR '.join(keywords)} | Modes: {', '.join(modes)}")
+        articles, saturated = search_serpapi_news(
+            query=build_keyword_query(keywords),
             serp_keys=SERP_API_KEYS,
             diffbot_keys=DIFFBOT_KEYS,
-            time_filter_mode=time_filter_mode,
+            time_filter_mode=modes,
             force_fresh=force_fresh,
+            key_pool=key_pool,
+            key_offset=index,  # Spread queries across the rotated keys
+            article_index=article_index,
+            skip=skip,
+            diffbot_pool=diffbot_pool,
         )
-        
-        key = f"{k1}_{k2}"
-        all_results[key] = articles
-        print(f"✅ {key}: {len(articles)} articles found")
-        
-        # Longer delay between keyword pairs
-        if i < len(keywords) - 2:
-            delay = random.uniform(15, 25)
-            print(f"⏳ Waiting {delay:.1f}s before next keyword pair...")
-            time.sleep(delay)
-
-    total_articles = sum(len(arts) for arts in all_results.values())
-    print(f"\n📊 SUMMARY: {total_articles} total articles across {len(all_results)} keyword pairs")
-    return all_results
+        if saturated and len(keywords) > 1:
+            # Too many hits for one query: split it and search both halves
+            middle = len(keywords) // 2
+            print(f"[PLAN] Splitting saturated query into {middle} + {len(keywords) - middle} keywords")
+            merged = {id(art): art for art in articles}
+            for offset, part in enumerate((keywords[:middle], keywords[middle:])):
+                for art in fetch_unit(index + offset, part, modes):
+                    merged.setdefault(id(art), art)
+            articles = list(merged.values())
+        return articles
+
+    # Queries run in parallel (in plan order, so the first briefing's
+    # keywords start first); the key pool's token buckets do the pacing
+    with ThreadPoolExecutor(max_workers=len(key_pool.keys)) as pool:
+        futures = {
+            pool.submit(fetch_unit, index, unit["keywords"], unit["modes"]): key
+            for index, (key, unit) in enumerate(plan.items())
+            if key in remaining
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            relevant = []
+            for art in future.result():
+                if "relevance" not in art:
+                    # Attribute to the keywords that actually appear in the
+                    # story and score it; shared copies are scored once.
+                    # The body is read back from the store for the scan.
+                    headline_hits = matcher.scan(art.get("headline"))
+                    body_hits = matcher.scan(art.get("content"))
+                    hits = headline_hits + body_hits
+                    art["keywords"] = [keyword for keyword, _ in hits.most_common()]
+                    art["keyword_hits"] = dict(hits)
+                    art["relevance"] = relevance_score(headline_hits, body_hits)
+                if art["relevance"] >= MIN_RELEVANCE_SCORE:
+                    relevant.append(art)
+                else:
+                    pruned += 1
+            print(f"✅ {key}: {len(relevant)} articles found")
+            if checkpoint is not None:
+                checkpoint.save_unit(key, relevant)
+            yield key, relevant
+    print(f"[Dedupe] {article_index.hits} repeat stories attached by reference, {len(article_index.by_url)} unique links")
+    diffbot_pool.report()
+    if pruned:
+        print(f"[Relevance] Pruned {pruned} results that mention none of the keywords")
+
+
+def merge_near_duplicates(data):
+    # Keep one representative per cluster of syndicated copies (same
+    # agency story on several sites) and list the other sources on it
+    unique = list({id(art): art for arts in data.values() for art in arts}.values())
+    replacement = {}
+    merged = 0
+    for members in cluster_articles(unique):
+        if len(members) == 1:
+            continue
+        keywords = []
+        for art in members:
+            keywords += [keyword for keyword in art.get("keywords", []) if keyword not in keywords]
+        representative = members[0].replace(
+            keywords=keywords,
+            relevance=max(art.get("relevance", 0) for art in members),
+            other_sources=[
+                {"site_name": art.get("site_name"), "url": art.get("url")} for art in members[1:]
+            ],
+        )
+        for art in members:
+            replacement[id(art)] = representative
+        merged += len(members) - 1
+    if merged:
+        print(f"[Cluster] Folded {merged} near-duplicate copies into their representatives")
+
+    merged_data = {}
+    for key, arts in data.items():
+        seen = set()
+        merged_data[key] = []
+        for art in arts:
+            art = replacement.get(id(art), art)
+            if id(art) not in seen:
+                seen.add(id(art))
+                merged_data[key].append(art)
+    return merged_data
+
+
+def split_briefing(results, name, keywords, time_filter_mode, seen=None):
+    # Collect the briefing's stories by their locally matched keywords,
+    # re-apply its time filter, group them into keyword pairs for the
+    # email, fold near-duplicates and rank each group by relevance.
+    # seen (SeenSet) drops stories the recipient was already sent.
+    ist = pytz.timezone("Asia/Kolkata")
+    wanted = set(keywords)
+    stories = {}
+    for articles in results.values():
+        for art in articles:
+            if id(art) in stories or not wanted & set(art.get("keywords", [])):
+                continue
+            pub_dt = ist.localize(datetime.strptime(art["published_at"], "%Y-%m-%d %H:%M IST"))
+            if in_time_window(pub_dt, time_filter_mode):
+                stories[id(art)] = art
+
+    data = {}
+    for group in keyword_groups(keywords):
+        data[group_key(group)] = [
+            art for art in stories.values() if set(group) & set(art["keywords"])
+        ]
+    data = merge_near_duplicates(data)
+    if seen is not None:
+        delivered = set()
+        for key, arts in data.items():
+            fresh = []
+            for art in arts:
+                if seen.has_story(art):
+                    delivered.add(id(art))
+                else:
+                    fresh.append(art)
+            data[key] = fresh
+        if delivered:
+            print(f"[SEEN] {name}: dropped {len(delivered)} stories already delivered")
+    for arts in data.values():
+        # Most relevant first: headline mentions, then body hit counts
+        arts.sort(key=lambda art: art.get("relevance", 0), reverse=True)
+    total_articles = len({id(art) for arts in data.values() for art in arts})
+    print(f"\n📊 {name}: {total_articles} articles across {len(data)} keyword groups")
+    return data
+
+
+def load_seen(recipients):
+    # {briefing name: SeenSet} for the briefings that have a recipient
+    store = get_store()
+    return {
+        name: SeenSet(*store.get_delivered(recipient))
+        for name, recipient in (recipients or {}).items()
+        if recipient
+    }
+
+
+def record_delivery(recipient, data):
+    # Remember every story (and its folded copies) sent to this recipient
+    articles = list({id(art): art for arts in data.values() for art in arts}.values())
+    url_hashes = set()
+    fingerprints = set()
+    for art in articles:
+        url_hashes.add(url_hash(art.get("url")))
+        if art.get("source_url"):
+            # The SerpAPI link skip() checks before extraction; Diffbot's
+            # pageUrl in "url" can differ from it
+            url_hashes.add(url_hash(art.get("source_url")))
+        url_hashes.update(url_hash(other.get("url")) for other in art.get("other_sources", []))
+        if art.get("fingerprint") is not None:
+            fingerprints.add(art["fingerprint"])
+    get_store().mark_delivered(recipient, url_hashes, fingerprints)
+
+
+def checkpoint_signature(briefings, ist_now):
+    # Same briefings, sources and run day -> a checkpoint can be resumed
+    spec = json.dumps([briefings, SITE_FILTER, ist_now.date().isoformat()], sort_keys=True)
+    return hashlib.sha1(spec.encode("utf-8")).hexdigest()
+
+
+def stream_briefings(briefings, force_fresh=False, recipients=None, checkpoint=None):
+    # Yields (name, data) for each briefing as soon as every query it needs
+    # has finished, so an early briefing is not held up by a later one's
+    # slowest query. recipients ({name: email}) enables the seen-store;
+    # checkpoint (RunCheckpoint) makes the fetch resumable.
+    plan = build_fetch_plan(briefings)
+    seen = load_seen(recipients)
+    requested = sum(len(keywords) for keywords, _ in briefings.values())
+    print(f"\n🗺️  Fetch plan: {len(plan)} queries for {len(briefings)} briefings ({requested} keywords)")
+
+    needed = {
+        name: [
+            key for key, unit in plan.items()
+            if mode in unit["modes"] and set(unit["keywords"]) & set(keywords)
+        ]
+        for name, (keywords, mode) in briefings.items()
+    }
+    results = {}
+    pending = list(briefings)
+
+    def skip(link, pub_dt):
+        # Not worth extracting if every briefing whose window holds this
+        # result has already delivered it
+        targets = [name for name, (_, mode) in briefings.items() if in_time_window(pub_dt, mode)]
+        return bool(targets) and all(name in seen and seen[name].has_url(link) for name in targets)
+
+    def ready():
+        done = [name for name in pending if all(key in results for key in needed[name])]
+        for name in done:
+            pending.remove(name)
+        return done
+
+    for name in ready():
+        yield name, split_briefing(results, name, *briefings[name], seen=seen.get(name))
+    for key, articles in stream_fetch_plan(
+        plan, force_fresh=force_fresh, skip=skip if seen else None, checkpoint=checkpoint
+    ):
+        results[key] = articles
+        for name in ready():
+            yield name, split_briefing(results, name, *briefings[name], seen=seen.get(name))
+
+
+def fetch_briefings(briefings, force_fresh=False, recipients=None):
+    return dict(stream_briefings(briefings, force_fresh=force_fresh, recipients=recipients))
+
+
+# -----------------------
+# Fetch for keywords (grouped in pairs for the email)
+# -----------------------
+def fetch_news_for_keywords(keywords, time_filter_mode, force_fresh=False):
+    print(f"\n🔍 Starting keyword search | Mode: {time_filter_mode} | Fresh: {force_fresh}")
+    briefings = {time_filter_mode: (keywords, time_filter_mode)}
+    return fetch_briefings(briefings, force_fresh=force_fresh)[time_filter_mode]
 
 
 # -----------------------
 # Enhanced Email Sender
 # -----------------------
-def send_email(sender, password, recipient, subject, data, time_window=""):
+def smtp_server_for(sender):
+    # Auto-detect SMTP unless SMTP_HOST overrides it
+    if SMTP_HOST:
+        return SMTP_HOST, SMTP_PORT
+    if sender.endswith("@gmail.com"):
+        return "smtp.gmail.com", 587
+    return "smtp.office365.com", 587
+
+
+def send_email(sender, password, recipient, subject, data, time_window="", wait=True):
+    # Queues the briefing on the background mailer. With wait=False returns
+    # a Future resolving to True/False, so the caller can carry on; several
+    # recipients may be given comma-separated and share one send.
+    sent = Future()
     try:
-        total_articles = sum(len(arts) for arts in data.values())
-        
-        body = f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-            <div style="max-width: 800px; margin: 0 auto; padding: 20px;">
-                <h1 style="color: #2c3e50; border-bottom: 2px solid #3498db; padding-bottom: 10px;">
-                    📢 Regulatory News Summary
-                </h1>
-                
-                <div style="background: #f8f9fa; padding: 15px; border-left: 4px solid #3498db; margin-bottom: 20px;">
-                    <p><strong>Time Window:</strong> {time_window}</p>
-                    <p><strong>Total Articles:</strong> {total_articles}</p>
-                    <p><small>Generated: {datetime.now(pytz.timezone("Asia/Kolkata")).strftime("%Y-%m-%d %H:%M:%S IST")}</small></p>
-                </div>
-        """
-
-        if total_articles == 0:
-            body += """
-                <div style="text-align: center; padding: 40px; color: #7f8c8d;">
-                    <h3>📭 No New Articles Found</h3>
-                    <p>No relevant regulatory news found in the specified time window.</p>
-                </div>
-            """
-        else:
-            for pair, articles in data.items():
-                if not articles:
-                    continue
-                    
-                pair_name = pair.replace("_", " & ").title()
-                body += f"""
-                    <h2 style="color: #2c3e50; margin-top: 30px;">
-                        {pair_name}
-                    </h2>
-                    <div style="background: white; border: 1px solid #e9ecef; border-radius: 8px; padding: 20px; margin-bottom: 20px;">
-                """
-                
-                for art in articles:
-                    snippet = (art.get('content') or '')[:350].replace('\n', ' ').strip()
-                    if len(art.get('content') or '') > 350:
-                        snippet += "... <a href='#'>[Read more]</a>"
-                    
-                    body += f"""
-                        <div style="border-bottom: 1px solid #e9ecef; padding: 15px 0;">
-                            <h3 style="margin: 0 0 8px 0; color: #2c3e50;">
-                                <a href="{art.get('url')}" style="text-decoration: none; color: #3498db;">
-                                    {art.get('headline')}
-                                </a>
-                            </h3>
-                            <p style="margin: 5px 0; color: #7f8c8d; font-size: 14px;">
-                                <strong>{art.get('site_name')}</strong> • 
-                                {art.get('published_at', 'Recently')}
-                            </p>
-                            <p style="margin: 10px 0; color: #555; line-height: 1.5;">
-                                {snippet}
-                            </p>
-                        </div>
-                    """
-                
-                body += "</div>"
-
-        body += """
-                <hr style="margin: 40px 0;">
-                <div style="text-align: center; color: #7f8c8d; font-size: 14px;">
-                    <p>This is an automated regulatory intelligence report.</p>
-                    <p>Questions? Reply to this email.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        total_articles = count_articles(data)
+        generated = datetime.now(pytz.timezone("Asia/Kolkata")).strftime("%Y-%m-%d %H:%M:%S IST")
 
         msg = MIMEMultipart("alternative")
         msg["From"] = sender
         msg["To"] = recipient
         msg["Subject"] = subject
-        msg.attach(MIMEText(body, "html"))
+        # Clients show the last part they support: plain text first
+        msg.attach(MIMEText(render_text(data, time_window, generated), "plain", "utf-8"))
+        msg.attach(MIMEText(render_html(data, time_window, generated), "html", "utf-8"))
 
-        # Auto-detect SMTP
-        if sender.endswith("@gmail.com"):
-            smtp_server = "smtp.gmail.com"
-            smtp_port = 587
-        else:
-            smtp_server = "smtp.office365.com"
-            smtp_port = 587
+        smtp_server, smtp_port = smtp_server_for(sender)
+        recipients = [address.strip() for address in recipient.split(",") if address.strip()]
+        queued = get_mailer().submit(
+            smtp_server, smtp_port, sender, password, recipients, msg.as_string(), starttls=SMTP_STARTTLS
+        )
 
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(sender, password)
-            server.sendmail(sender, recipient, msg.as_string())
+        def delivered(future):
+            error = future.exception()
+            if error is None:
+                refused = future.result()
+                if refused:
+                    print(f"[Email Warning] Refused recipients: {', '.join(refused)}")
+                print(f"✅ Email sent: {sender} → {recipient} | {total_articles} articles | {time_window}")
+                metrics.count("emails_sent")
+                metrics.count("articles_delivered", total_articles)
+            else:
+                print(f"[Email Error] {error}")
+                metrics.count("emails_failed")
+            sent.set_result(error is None)
+
+        queued.add_done_callback(delivered)
 
-        print(f"✅ Email sent: {sender} → {recipient} | {total_articles} articles | {time_window}")
-        
     except Exception as e:
         print(f"[Email Error] {e}")
+        metrics.count("emails_failed")
         import traceback
         traceback.print_exc()
+        sent.set_result(False)
+
+    return sent.result() if wait else sent
 
 
 # -----------------------
 # Main Runner
 # -----------------------
-def main():
+def main(resume=False, allow_stale=False):
     ist_now = datetime.now(pytz.timezone("Asia/Kolkata"))
+
+    # Every enabled briefing in briefings.json, e.g. founder (today
+    # 7 AM – 10 AM IST) and new member (yesterday 7 AM – 12 PM IST)
+    configured = enabled_briefings(CONFIG)
+    briefings = {
+        briefing["name"]: (briefing_keywords(CONFIG, briefing), briefing["window"])
+        for briefing in configured
+    }
+
+    # A checkpoint is only resumed if it was made for these briefings and
+    # today's run (the cache restore may hand over an older run's state);
+    # then its clock is adopted so the time windows (and with them the
+    # fetch plan) are the same. Otherwise the run starts fresh on now.
+    checkpoint = RunCheckpoint.load() if resume else None
+    if checkpoint is not None:
+        started = datetime.fromisoformat(checkpoint.started_at) if checkpoint.started_at else None
+        if started is None or not checkpoint.matches(checkpoint_signature(briefings, started)):
+            print("[Resume] No matching checkpoint, starting a fresh run")
+            checkpoint = None
+        elif started.date() < ist_now.date() and not allow_stale:
+            print(f"[Resume] Checkpoint is from {started.date()}, before today's run - starting a fresh run "
+                  f"(--allow-stale resumes it anyway)")
+            checkpoint = None
+        else:
+            ist_now = started
+            print(f"[Resume] Continuing the run started {ist_now.strftime('%Y-%m-%d %H:%M IST')}")
+    elif resume:
+        print("[Resume] No checkpoint found, starting a fresh run")
+    if checkpoint is None:
+        checkpoint = RunCheckpoint()
+        checkpoint.start(checkpoint_signature(briefings, ist_now), ist_now.isoformat())
+
+    init_time_windows(ist_now)
     print(f"\n🚀 Regulatory News Pipeline Started: {ist_now.strftime('%Y-%m-%d %H:%M:%S IST')}")
     print(f"Environment: {'Local' if os.getenv('DEVELOPMENT') else 'Production'}")
 
-    # Random startup delay to avoid simultaneous runs
-    startup_delay = random.uniform(5, 15)
-    print(f"⏳ Startup delay: {startup_delay:.1f}s")
-    time.sleep(startup_delay)
+    dates = {"today": ist_now, "yesterday": ist_now - timedelta(days=1)}
+    deliveries = {
+        briefing["name"]: {
+            "banner": briefing["banner"],
+            "sender": os.getenv(briefing["sender_env"]),
+            "password": os.getenv(briefing["password_env"]),
+            "recipient": os.getenv(briefing["recipient_env"]),
+            "subject": briefing["subject"].format(**dates),
+            "time_window": briefing["time_window"].format(**dates),
+        }
+        for briefing in configured
+    }
+    print(f"[Config] {len(briefings)} briefing(s): {', '.join(briefings)}")
 
-    # Founder: Today 7 AM – 10 AM IST
-    print("\n" + "="*60)
-    print("👑 FOUNDER BRIEFING: Today 07:00 – 10:00 IST")
-    print("="*60)
-    
-    founder_data = fetch_news_for_keywords(
-        keywords=BASE_KEYWORDS,
-        time_filter_mode="today_7_to_10",
-        force_fresh=True  # Always fresh for founder
-    )
-    
-    founder_time_window = f"Today • {ist_now.strftime('%b %d')} • 07:00–10:00 IST"
-    send_email(
-        sender=os.getenv("NEW_MEMBER_INPUT_EMAIL"),
-        password=os.getenv("NEW_MEMBER_APP_PASSWORD"),
-        recipient=os.getenv("FOUNDER_EMAIL"),
-        subject=f"🚨 Regulatory Morning Brief | {ist_now.strftime('%b %d')}",
-        data=founder_data,
-        time_window=founder_time_window
-    )
+    # One fetch plan for all briefings: shared keywords are queried and
+    # extracted once. Each briefing is sent as soon as its own queries are
+    # done, while the remaining queries keep running. Stories a recipient
+    # was already sent (earlier run, overlapping window) are left out.
+    # Mail goes out in the background, one SMTP connection per sender.
+    # Progress is checkpointed, so a failed run can be finished with --resume.
+    recipients = {name: delivery["recipient"] for name, delivery in deliveries.items()}
 
-    # New Member: Yesterday 7 AM – 12 PM IST
-    print("\n" + "="*60)
-    print("👤 NEW MEMBER BRIEFING: Yesterday 07:00 – 12:00 IST")
-    print("="*60)
-    
-    yesterday = ist_now - timedelta(days=1)
-    new_member_data = fetch_news_for_keywords(
-        keywords=KEYWORDS_NEW_MEMBER,
-        time_filter_mode="yesterday_7am_to_12pm",
-        force_fresh=True  # Force fresh results
-    )
+    def delivered(future, name, recipient, data):
+        # Runs on the mailer thread once the server has accepted the mail
+        if future.result():
+            checkpoint.mark_sent(name)
+            if recipient:
+                record_delivery(recipient, data)
 
-    new_member_time_window = f"Yesterday • {yesterday.strftime('%b %d')} • 07:00–12:00 IST"
-    send_email(
-        sender=os.getenv("NEW_MEMBER_INPUT_EMAIL"),
-        password=os.getenv("NEW_MEMBER_APP_PASSWORD"),
-        recipient=os.getenv("NEW_MEMBER_OUTPUT_EMAIL"),
-        subject=f"📋 Regulatory & Risk Alert | {yesterday.strftime('%b %d')} Full Day",
-        data=new_member_data,
-        time_window=new_member_time_window
-    )
+    for name, data in stream_briefings(
+        briefings, force_fresh=True, recipients=recipients, checkpoint=checkpoint  # Always fresh
+    ):
+        delivery = deliveries[name]
+        print("\n" + "="*60)
+        print(delivery["banner"])
+        print("="*60)
+        if checkpoint.was_sent(name):
+            print(f"[Resume] {name} briefing was already sent, skipping")
+            continue
+
+        sent = send_email(
+            sender=delivery["sender"],
+            password=delivery["password"],
+            recipient=delivery["recipient"],
+            subject=delivery["subject"],
+            data=data,
+            time_window=delivery["time_window"],
+            wait=False,
+        )
+        sent.add_done_callback(
+            lambda future, name=name, recipient=delivery["recipient"], data=data:
+                delivered(future, name, recipient, data)
+        )
+
+    get_mailer().close()  # Waits for queued mail, then logs out
+    if all(checkpoint.was_sent(name) for name in briefings):
+        checkpoint.clear()  # Nothing left to resume
+
+    get_store().report()
+    metrics.write()
 
     print("\n" + "="*60)
     print("✅ ALL JOBS COMPLETED SUCCESSFULLY")
@@ -481,11 +1275,21 @@ def main():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Daily regulatory news briefings")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted run from its checkpoint instead of starting over")
+    parser.add_argument("--allow-stale", action="store_true",
+                        help="with --resume, also resume a checkpoint started on an earlier day")
+    args = parser.parse_args()
     try:
-        main()
+        main(resume=args.resume, allow_stale=args.allow_stale)
     except KeyboardInterrupt:
         print("\n⚠️  Script interrupted by user")
     except Exception as e:
         print(f"\n💥 CRITICAL ERROR: {e}")
         import traceback
-        traceback.print_exc()
\ No newline at end of file
+        traceback.print_exc()
+        metrics.count("run_failed")
+        get_mailer().close()  # Still deliver briefings that were already queued
+        metrics.write()  # Partial numbers still show where the time went
+        raise SystemExit(1)  # Fail the job so it can be re-run with --resume
\ No newline at end of file